@@ -0,0 +1,157 @@
+"""
+サーキットブレーカーモジュール。
+
+DB が劣化したときに、接続プールを使い切るまで待たせずに即座に失敗させるための
+サーキットブレーカーを提供する。
+
+状態:
+    - closed: すべての呼び出しを通す。連続失敗数が閾値に達すると open に移る
+    - open: すべての呼び出しを CircuitOpenError で拒否する。一定時間後に half_open に移る
+    - half_open: 一定数のプローブだけを通し、成功すれば closed、失敗すれば open に戻る
+
+エラーだけでなく、応答時間が閾値を超えた呼び出しも失敗として数える。
+half_open からの遷移はプローブの結果だけで決め、open になる前に通過していた
+呼び出しの結果が遅れて届いても状態は変えない。
+
+クラス:
+    - CircuitBreaker: サーキットブレーカー
+
+例:
+    breaker = CircuitBreaker(failure_threshold=5, slow_call_seconds=2.0)
+    probe = breaker.acquire()
+    try:
+        ...
+    except OperationalError:
+        breaker.record_failure(probe)
+        raise
+    else:
+        breaker.record_success(latency, probe)
+"""
+import time
+from typing import Callable
+
+from api.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    サーキットブレーカー。
+
+    単一のイベントループから使う前提で、ロックは取らない。
+    acquire で通過した呼び出しは、acquire の戻り値 (プローブかどうか) を添えて
+    record_success / record_failure / release のいずれかで必ず結果を報告する。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 2.0,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """
+        現在の状態を返す。
+
+        open のまま open_seconds が経過していれば half_open を返す。
+
+        Returns:
+            str: closed / open / half_open のいずれか
+        """
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def acquire(self) -> bool:
+        """
+        呼び出しの可否を判定する。
+
+        Returns:
+            bool: half_open のプローブとして通過した場合は True
+
+        Raises:
+            CircuitOpenError: open の場合、または half_open でプローブが埋まっている場合
+        """
+        state = self.state
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and self._probes < self.half_open_probes:
+            self._probes += 1
+            return True
+        retry_after = self._opened_at + self.open_seconds - self._clock()
+        raise CircuitOpenError(retry_after=max(retry_after, 1.0))
+
+    def record_success(self, latency: float, probe: bool = False) -> None:
+        """
+        呼び出しの成功を記録する。
+
+        latency が slow_call_seconds 以上の場合は失敗として数える。
+
+        Args:
+            latency (float): 呼び出しの応答時間 (秒)
+            probe (bool): acquire の戻り値 (プローブかどうか)
+
+        Returns:
+            なし
+        """
+        if latency >= self.slow_call_seconds:
+            self.record_failure(probe)
+            return
+        if self._state == HALF_OPEN and probe:
+            self._state = CLOSED
+            self._failures = 0
+        elif self._state == CLOSED:
+            self._failures = 0
+
+    def record_failure(self, probe: bool = False) -> None:
+        """
+        呼び出しの失敗を記録する。
+
+        Args:
+            probe (bool): acquire の戻り値 (プローブかどうか)
+
+        Returns:
+            なし
+        """
+        if self._state == HALF_OPEN and probe:
+            self._open()
+        elif self._state == CLOSED:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self, probe: bool = False) -> None:
+        """
+        結果を判定できなかった呼び出し (キャンセルなど) を記録せずに終える。
+
+        Args:
+            probe (bool): acquire の戻り値 (プローブかどうか)
+
+        Returns:
+            なし
+        """
+        if self._state == HALF_OPEN and probe and self._probes > 0:
+            self._probes -= 1
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._failures = 0
+        self._probes = 0
@@ -2,11 +2,17 @@
 著者 CRUD 操作モジュール。
 
 このモジュールは、DB の authors テーブルに対する
-非同期 CRUD (作成・取得) 操作を提供する。
+非同期 CRUD (作成・取得・更新) 操作を提供する。
+作成・更新では、スナップショット差分更新用の変更履歴も同一トランザクションで記録する。
 
 関数:
-    - create_author: 著者を作成する
+    - create_author: 著者を作成する (著者数カウンタも同一トランザクションで更新する)
     - get_authors: 著者一覧を取得する
+    - get_authors_projection: 指定カラムのみで著者一覧を取得する
+    - get_authors_by_ids: 複数 ID の著者を 1 クエリで取得する
+    - get_author_book_count: 著者の書籍数を取得する
+    - get_author_by_id: ID で著者を取得する
+    - update_author: バージョンを条件に著者を部分更新する
 
 利用方法:
     - これらの関数をインポートして authors テーブルを操作する
@@ -24,17 +30,23 @@
         # 著者一覧を取得する
         authors_list = await get_authors(db)
 """
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import LargeBinary, cast, select, update
 from sqlalchemy.engine import Result
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import api.schemas.author as author_schema
-from api.exceptions import IntegrityViolationError
+from api.cruds.change import record_change
+from api.cruds.counter import increment_counter
+from api.exceptions import IntegrityViolationError, VersionConflictError
 from api.models import model
 
+# スナップショット (Python の文字列比較) と同じ順序にするため、照合順序ではなく
+# UTF-8 のバイト列で比較する (UTF-8 のバイト順はコードポイント順と一致する)
+_LIST_ORDER = (cast(model.Author.name, LargeBinary), model.Author.id)
+
 
 async def create_author(
     db: AsyncSession, author_create: author_schema.AuthorCreate
@@ -55,6 +67,9 @@ async def create_author(
     try:
         author = model.Author(**author_create.model_dump())
         db.add(author)
+        await db.flush()
+        await increment_counter(db, name="authors", delta=1)
+        await record_change(db, table_name="authors", row_id=author.id)
         await db.commit()
         await db.refresh(author)
         return author
@@ -63,17 +78,161 @@ async def create_author(
         raise IntegrityViolationError from e
 
 
-async def get_authors(db: AsyncSession) -> List[model.Author]:
+async def get_authors(
+    db: AsyncSession, offset: int = 0, limit: Optional[int] = None
+) -> List[model.Author]:
     """
     著者一覧を DB から取得する。
 
+    名前のコードポイント順 (DB の照合順序によらない) に返し、同じ値の行は ID 順に並べる
+    (スナップショットの並び順と同じ)。
+
     Args:
         db (AsyncSession): 非同期 SQLAlchemy セッション
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
 
     Returns:
         List[model.Author]: 著者一覧
     """
     result: Result = await db.execute(
-        select(model.Author).order_by(model.Author.name)
+        select(model.Author).order_by(*_LIST_ORDER).offset(offset).limit(limit)
     )
     return result.scalars().all()
+
+
+async def get_authors_projection(
+    db: AsyncSession,
+    fields: Sequence[str],
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    指定カラムのみを SELECT して著者一覧を DB から取得する。
+
+    名前のコードポイント順 (DB の照合順序によらない) に返し、同じ値の行は ID 順に並べる
+    (スナップショットの並び順と同じ)。
+
+    エンティティを生成せず、行をそのまま辞書として返す。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        fields (Sequence[str]): 取得するカラム名 (author_schema.AUTHOR_FIELDS の部分集合)
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
+
+    Returns:
+        List[Dict[str, Any]]: 著者一覧 (指定カラムのみ)
+    """
+    columns = [getattr(model.Author, field) for field in fields]
+    result: Result = await db.execute(
+        select(*columns).order_by(*_LIST_ORDER).offset(offset).limit(limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_authors_by_ids(
+    db: AsyncSession, author_ids: Sequence[str], fields: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """
+    複数 ID の著者を WHERE id IN (...) の 1 クエリで DB から取得する。
+
+    結果の順序は保証しない。呼び出し側で ID をキーに並べ替えること。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        author_ids (Sequence[str]): 取得する著者 ID (UUID) の一覧
+        fields (Sequence[str]): 取得するカラム名 (id を含めること)
+
+    Returns:
+        List[Dict[str, Any]]: 見つかった著者 (指定カラムのみ)
+    """
+    columns = [getattr(model.Author, field) for field in fields]
+    result: Result = await db.execute(
+        select(*columns).filter(model.Author.id.in_(author_ids))
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_author_book_count(db: AsyncSession, author_id: str) -> Optional[int]:
+    """
+    著者の書籍数を DB から取得する。
+
+    books を COUNT(*) せず、authors.book_count を参照する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        author_id (str): 著者 ID (UUID)
+
+    Returns:
+        Optional[int]: 書籍数 (著者が未検出なら None)
+    """
+    result: Result = await db.execute(
+        select(model.Author.book_count).filter(model.Author.id == author_id)
+    )
+    return result.scalar()
+
+
+async def get_author_by_id(db: AsyncSession, author_id: str) -> Optional[model.Author]:
+    """
+    ID で著者を DB から取得する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        author_id (str): 取得する著者 ID (UUID)
+
+    Returns:
+        Optional[model.Author]: 著者データ (未検出なら None)
+    """
+    result: Result = await db.execute(
+        select(model.Author).filter(model.Author.id == author_id)
+    )
+    author: Optional[Tuple[model.Author]] = result.first()
+    return author[0] if author else None
+
+
+async def update_author(
+    db: AsyncSession,
+    author_id: str,
+    author_update: author_schema.AuthorUpdate,
+    version: Optional[int],
+) -> Optional[model.Author]:
+    """
+    バージョンを条件に著者を DB 上で部分更新する。
+
+    UPDATE ... WHERE id = ? AND version = ? の条件付き更新 1 文で反映し、
+    SELECT ... FOR UPDATE による行ロックは取らない。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        author_id (str): 更新する著者 ID (UUID)
+        author_update (author_schema.AuthorUpdate): 著者更新データ (指定フィールドのみ更新)
+        version (Optional[int]): 期待するバージョン (None なら無条件)
+
+    Returns:
+        Optional[model.Author]: 更新後の著者データ (未検出なら None)
+
+    Raises:
+        VersionConflictError: 著者のバージョンが version と一致しない場合
+    """
+    statement = (
+        update(model.Author)
+        .where(model.Author.id == author_id)
+        .values(
+            **author_update.model_dump(exclude_unset=True),
+            version=model.Author.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if version is not None:
+        statement = statement.where(model.Author.version == version)
+    result: Result = await db.execute(statement)
+    if result.rowcount == 0:
+        await db.rollback()
+        if await get_author_by_id(db, author_id=author_id) is None:
+            return None
+        raise VersionConflictError
+    await record_change(db, table_name="authors", row_id=author_id)
+    await db.commit()
+
+    return await get_author_by_id(db, author_id=author_id)
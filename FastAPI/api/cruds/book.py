@@ -3,10 +3,16 @@
 
 このモジュールは、books テーブルに対する CRUD (作成・取得・削除) 操作を提供する。
 
+書籍の作成・削除では、著者の書籍数と書籍総数のカウンタを同一トランザクションで更新する。
+作成・更新・削除では、スナップショット差分更新用の変更履歴も同一トランザクションで記録する。
+
 関数:
     - create_book: 書籍を作成する
     - get_books: 書籍一覧を取得する
+    - get_books_projection: 指定カラムのみで書籍一覧を取得する
     - get_book_by_id: ID で書籍を取得する
+    - get_books_by_ids: 複数 ID の書籍を 1 クエリで取得する
+    - update_book: バージョンを条件に書籍を部分更新する
     - delete_book: 書籍を削除する
 
 利用方法:
@@ -26,23 +32,32 @@
         # 書籍一覧を取得する
         books_list = await get_books(session)
 
+        # id と title のみで書籍一覧を取得する
+        books_rows = await get_books_projection(session, fields=("id", "title"))
+
         # ID で書籍を取得する
         book_by_id = await get_book_by_id(session, book_id=created_book.id)
 
         # 書籍を削除する
         await delete_book(session, original=book_by_id)
 """
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import LargeBinary, cast, delete, select, update
 from sqlalchemy.engine import Result
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import api.schemas.book as book_schema
-from api.exceptions import IntegrityViolationError
+from api.cruds.change import record_change
+from api.cruds.counter import increment_counter
+from api.exceptions import IntegrityViolationError, VersionConflictError
 from api.models import model
 
+# スナップショット (Python の文字列比較) と同じ順序にするため、照合順序ではなく
+# UTF-8 のバイト列で比較する (UTF-8 のバイト順はコードポイント順と一致する)
+_LIST_ORDER = (cast(model.Book.title, LargeBinary), model.Book.id)
+
 
 async def create_book(
     db: AsyncSession, book_create: book_schema.BookCreate
@@ -63,6 +78,10 @@ async def create_book(
     try:
         book = model.Book(**book_create.model_dump())
         db.add(book)
+        await db.flush()
+        await _increment_author_book_count(db, author_id=book.author_id, delta=1)
+        await increment_counter(db, name="books", delta=1)
+        await record_change(db, table_name="books", row_id=book.id)
         await db.commit()
         await db.refresh(book)
         return book
@@ -71,22 +90,59 @@ async def create_book(
         raise IntegrityViolationError from e
 
 
-async def get_books(db: AsyncSession) -> List[model.Book]:
+async def get_books(
+    db: AsyncSession, offset: int = 0, limit: Optional[int] = None
+) -> List[model.Book]:
     """
     書籍一覧を DB から取得する。
 
+    タイトルのコードポイント順 (DB の照合順序によらない) に返し、同じ値の行は ID 順に並べる
+    (スナップショットの並び順と同じ)。
+
     Args:
         db (AsyncSession): 非同期 SQLAlchemy セッション
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
 
     Returns:
         List[model.Book]: 書籍一覧
     """
     result: Result = await db.execute(
-        select(model.Book).order_by(model.Book.title)
+        select(model.Book).order_by(*_LIST_ORDER).offset(offset).limit(limit)
     )
     return result.scalars().all()
 
 
+async def get_books_projection(
+    db: AsyncSession,
+    fields: Sequence[str],
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    指定カラムのみを SELECT して書籍一覧を DB から取得する。
+
+    タイトルのコードポイント順 (DB の照合順序によらない) に返し、同じ値の行は ID 順に並べる
+    (スナップショットの並び順と同じ)。
+
+    エンティティを生成せず、行をそのまま辞書として返す。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        fields (Sequence[str]): 取得するカラム名 (book_schema.BOOK_FIELDS の部分集合)
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
+
+    Returns:
+        List[Dict[str, Any]]: 書籍一覧 (指定カラムのみ)
+    """
+    columns = [getattr(model.Book, field) for field in fields]
+    result: Result = await db.execute(
+        select(*columns).order_by(*_LIST_ORDER).offset(offset).limit(limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
 async def get_book_by_id(db: AsyncSession, book_id: str) -> Optional[model.Book]:
     """
     ID で書籍を DB から取得する。
@@ -105,16 +161,156 @@ async def get_book_by_id(db: AsyncSession, book_id: str) -> Optional[model.Book]
     return book[0] if book else None
 
 
-async def delete_book(db: AsyncSession, original: model.Book) -> None:
+async def get_books_by_ids(
+    db: AsyncSession, book_ids: Sequence[str], fields: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """
+    複数 ID の書籍を WHERE id IN (...) の 1 クエリで DB から取得する。
+
+    結果の順序は保証しない。呼び出し側で ID をキーに並べ替えること。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        book_ids (Sequence[str]): 取得する書籍 ID (UUID) の一覧
+        fields (Sequence[str]): 取得するカラム名 (id を含めること)
+
+    Returns:
+        List[Dict[str, Any]]: 見つかった書籍 (指定カラムのみ)
+    """
+    columns = [getattr(model.Book, field) for field in fields]
+    result: Result = await db.execute(
+        select(*columns).filter(model.Book.id.in_(book_ids))
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+async def update_book(
+    db: AsyncSession,
+    book_id: str,
+    book_update: book_schema.BookUpdate,
+    version: Optional[int],
+) -> Optional[model.Book]:
+    """
+    バージョンを条件に書籍を DB 上で部分更新する。
+
+    UPDATE ... WHERE id = ? AND version = ? の条件付き更新 1 文で反映し、
+    SELECT ... FOR UPDATE による行ロックは取らない。
+    author_id を変更する場合は、更新前の著者を読み取ったバージョンで条件付けし、
+    両著者の書籍数を同一トランザクションで付け替える。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        book_id (str): 更新する書籍 ID (UUID)
+        book_update (book_schema.BookUpdate): 書籍更新データ (指定フィールドのみ更新)
+        version (Optional[int]): 期待するバージョン (None なら無条件)
+
+    Returns:
+        Optional[model.Book]: 更新後の書籍データ (未検出なら None)
+
+    Raises:
+        VersionConflictError: 書籍のバージョンが version と一致しない場合
+        IntegrityViolationError: DB の整合性制約に違反した場合 (例: author_id 不正)
+    """
+    values = book_update.model_dump(exclude_unset=True)
+    previous_author_id: Optional[str] = None
+    try:
+        if "author_id" in values:
+            result: Result = await db.execute(
+                select(model.Book.author_id, model.Book.version).filter(
+                    model.Book.id == book_id
+                )
+            )
+            current = result.first()
+            if current is None:
+                return None
+            if version is not None and current.version != version:
+                raise VersionConflictError
+            # 条件付き UPDATE が成功すれば、読み取った author_id から変わっていないことが保証される
+            version = current.version
+            previous_author_id = current.author_id
+
+        statement = (
+            update(model.Book)
+            .where(model.Book.id == book_id)
+            .values(**values, version=model.Book.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if version is not None:
+            statement = statement.where(model.Book.version == version)
+        result = await db.execute(statement)
+        if result.rowcount == 0:
+            await db.rollback()
+            if await get_book_by_id(db, book_id=book_id) is None:
+                return None
+            raise VersionConflictError
+
+        if previous_author_id is not None and previous_author_id != values["author_id"]:
+            await _increment_author_book_count(
+                db, author_id=previous_author_id, delta=-1
+            )
+            await _increment_author_book_count(
+                db, author_id=values["author_id"], delta=1
+            )
+        await record_change(db, table_name="books", row_id=book_id)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise IntegrityViolationError from e
+
+    return await get_book_by_id(db, book_id=book_id)
+
+
+async def delete_book(db: AsyncSession, original: model.Book) -> bool:
     """
     書籍を DB から削除する。
 
+    DELETE はバージョンを条件に発行し、1 行削除できた場合だけ件数カウンタを減らす。
+    読み取り後に別のリクエストが著者を変更していた場合は読み直して再試行し、
+    変更後の著者の書籍数を減らす。
+
     Args:
         db (AsyncSession): 非同期 SQLAlchemy セッション
         original (model.Book): 削除対象の書籍データ
 
     Returns:
-        なし
+        bool: 削除した場合は True (すでに削除されていた場合は False)
     """
-    await db.delete(original)
+    book_id, author_id, version = original.id, original.author_id, original.version
+    while True:
+        result: Result = await db.execute(
+            delete(model.Book)
+            .where(model.Book.id == book_id, model.Book.version == version)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            break
+        # トランザクションを終えてから読み直し、最新の author_id とバージョンを取得する
+        await db.rollback()
+        current = (
+            await db.execute(
+                select(model.Book.author_id, model.Book.version).filter(
+                    model.Book.id == book_id
+                )
+            )
+        ).first()
+        if current is None:
+            await db.rollback()
+            return False
+        author_id, version = current
+
+    await _increment_author_book_count(db, author_id=author_id, delta=-1)
+    await increment_counter(db, name="books", delta=-1)
+    await record_change(db, table_name="books", row_id=book_id)
     await db.commit()
+    return True
+
+
+async def _increment_author_book_count(
+    db: AsyncSession, author_id: str, delta: int
+) -> None:
+    await db.execute(
+        update(model.Author)
+        .where(model.Author.id == author_id)
+        .values(book_count=model.Author.book_count + delta)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,109 @@
+"""
+変更履歴 CRUD 操作モジュール。
+
+このモジュールは、changes テーブルに対する変更の記録・取得・削除操作を提供する。
+変更履歴はインメモリスナップショットの差分更新に使用する。
+
+関数:
+    - record_change: 変更を記録する (コミットしない)
+    - get_changes_since: 指定シーケンスより後の変更を取得する
+    - get_change_seq_range: 保持している変更シーケンスの最小値・最大値を取得する
+    - prune_changes: 古い変更履歴を削除する
+
+利用方法:
+    - 作成・更新・削除を行う CRUD 関数から record_change を呼び出し、
+      本体の変更と同じトランザクションでコミットする
+
+例:
+    from api.cruds.change import record_change
+
+    async with get_db() as db:
+        db.add(book)
+        await db.flush()
+        await record_change(db, table_name="books", row_id=book.id)
+        await db.commit()
+"""
+from typing import List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models import model
+
+
+async def record_change(db: AsyncSession, table_name: str, row_id: str) -> None:
+    """
+    変更を記録する。
+
+    コミットは呼び出し側で行い、本体の変更と同一トランザクションに含めること。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        table_name (str): 変更されたテーブル名 (authors / books)
+        row_id (str): 変更された行の ID (UUID)
+
+    Returns:
+        なし
+    """
+    await db.execute(insert(model.Change).values(table_name=table_name, row_id=row_id))
+
+
+async def get_changes_since(
+    db: AsyncSession, seq: int, limit: int
+) -> List[Tuple[int, str, str]]:
+    """
+    指定シーケンスより後の変更をシーケンス順に取得する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        seq (int): 取得済みの変更シーケンス
+        limit (int): 取得する最大件数
+
+    Returns:
+        List[Tuple[int, str, str]]: (シーケンス, テーブル名, 行 ID) の一覧
+    """
+    result: Result = await db.execute(
+        select(model.Change.seq, model.Change.table_name, model.Change.row_id)
+        .filter(model.Change.seq > seq)
+        .order_by(model.Change.seq)
+        .limit(limit)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def get_change_seq_range(db: AsyncSession) -> Tuple[int, int]:
+    """
+    保持している変更シーケンスの最小値・最大値を取得する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+
+    Returns:
+        Tuple[int, int]: (最小値, 最大値) (変更履歴がなければ (0, 0))
+    """
+    result: Result = await db.execute(
+        select(func.min(model.Change.seq), func.max(model.Change.seq))
+    )
+    first, last = result.one()
+    return first or 0, last or 0
+
+
+async def prune_changes(db: AsyncSession, keep: int) -> None:
+    """
+    最新 keep 件より古い変更履歴を削除する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        keep (int): 保持する件数
+
+    Returns:
+        なし
+    """
+    _, last = await get_change_seq_range(db)
+    await db.execute(
+        delete(model.Change)
+        .where(model.Change.seq <= last - keep)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
@@ -0,0 +1,140 @@
+"""
+件数カウンタ CRUD 操作モジュール。
+
+このモジュールは、counters テーブルと authors.book_count に対する
+カウンタの更新・取得・再計算操作を提供する。
+
+関数:
+    - increment_counter: カウンタを増減する (コミットしない)
+    - get_counter: カウンタの値を取得する
+    - reconcile_counters: 実テーブルの件数からカウンタを再計算する
+
+利用方法:
+    - 作成・削除を行う CRUD 関数から increment_counter を呼び出し、
+      本体の変更と同じトランザクションでコミットする
+
+例:
+    from api.cruds.counter import get_counter, increment_counter
+
+    async with get_db() as db:
+        db.add(book)
+        await increment_counter(db, name="books", delta=1)
+        await db.commit()
+
+        total = await get_counter(db, name="books")
+"""
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.models import model
+
+RECONCILE_CHUNK_SIZE = 1000
+
+
+async def increment_counter(db: AsyncSession, name: str, delta: int) -> None:
+    """
+    カウンタを増減する。
+
+    コミットは呼び出し側で行い、本体の変更と同一トランザクションに含めること。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        name (str): カウンタ名 (model.COUNTER_NAMES のいずれか)
+        delta (int): 増減量
+
+    Returns:
+        なし
+    """
+    await db.execute(
+        update(model.Counter)
+        .where(model.Counter.name == name)
+        .values(value=model.Counter.value + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_counter(db: AsyncSession, name: str) -> int:
+    """
+    カウンタの値を取得する。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        name (str): カウンタ名 (model.COUNTER_NAMES のいずれか)
+
+    Returns:
+        int: カウンタの値 (行が存在しなければ 0)
+    """
+    result: Result = await db.execute(
+        select(model.Counter.value).filter(model.Counter.name == name)
+    )
+    return result.scalar() or 0
+
+
+async def reconcile_counters(
+    db: AsyncSession, chunk_size: int = RECONCILE_CHUNK_SIZE
+) -> None:
+    """
+    実テーブルの件数から authors.book_count と counters を再計算する。
+
+    トランザクション外の変更や障害で生じたずれを補正するための定期ジョブ用。
+    authors.book_count は著者 ID の範囲ごとにずれている行だけを更新してコミットし、
+    書籍の作成・削除が待つ行ロックを chunk_size 件の範囲・短い時間に限る。
+    各カウンタは UPDATE ... SET value = (SELECT COUNT(*) ...) の 1 文で更新するため、
+    再計算と並行して行われた作成・削除による増減は失われない。
+
+    Args:
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+        chunk_size (int): 1 トランザクションで再計算する著者数
+
+    Returns:
+        なし
+    """
+    book_count = (
+        select(func.count(model.Book.id))
+        .where(model.Book.author_id == model.Author.id)
+        .correlate(model.Author)
+        .scalar_subquery()
+    )
+    last_id = ""
+    while True:
+        result: Result = await db.execute(
+            select(model.Author.id)
+            .where(model.Author.id > last_id)
+            .order_by(model.Author.id)
+            .limit(chunk_size)
+        )
+        author_ids = result.scalars().all()
+        if not author_ids:
+            break
+        await db.execute(
+            update(model.Author)
+            .where(
+                model.Author.id > last_id,
+                model.Author.id <= author_ids[-1],
+                model.Author.book_count != book_count,
+            )
+            .values(book_count=book_count)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        last_id = author_ids[-1]
+
+    sources = {"authors": model.Author, "books": model.Book}
+    for name in model.COUNTER_NAMES:
+        # 件数の取得と書き戻しを 1 文で行い、その間に行われた増減を失わないようにする
+        total = select(func.count(sources[name].id)).scalar_subquery()
+        result = await db.execute(
+            update(model.Counter)
+            .where(model.Counter.name == name)
+            .values(value=total)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await db.execute(
+                insert(model.Counter).from_select(
+                    ["name", "value"], select(literal(name), total)
+                )
+            )
+
+    await db.commit()
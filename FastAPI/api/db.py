@@ -4,30 +4,129 @@
 SQLAlchemy の非同期機能を使って DB 接続を管理する。
 非同期エンジンとセッションの生成、および DB セッション取得用の関数を提供する。
 
+エンジンはインポート時には生成せず、アプリケーション起動時に init_engine で生成する。
+get_db で取得したセッションはサーキットブレーカーで保護し、最初のトランザクション開始時に
+DB への呼び出し可否を判定する。リクエストの期限切れで中断したセッションの接続は
+プールに戻さずに破棄する。
+
 利用方法:
-    - async_engine / async_session / Base をインポートする
+    - init_engine で設定からエンジンを生成し、async_session をエンジンに紐付ける
+    - async_session / Base をインポートする
     - get_db コルーチンで非同期セッションを取得する
+    - 終了時に dispose_engine で接続プールを破棄する
 
 例:
+    init_engine(Settings.from_env())
     async with get_db() as session:
         # session を使って DB 操作を行う
 
 注意:
-    ASYNC_DB_URL は接続先に合わせて更新すること
+    接続先は Settings.db_url (環境変数 BOOKS_API_DB_URL) で指定する
 """
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-ASYNC_DB_URL = "mysql+aiomysql://root@db:3306/prod?charset=utf8"
+from api.circuit_breaker import CircuitBreaker
+from api.deadlines import current_deadline, install_statement_deadlines
+from api.exceptions import DeadlineExceededError
+from api.settings import Settings
 
-async_engine = create_async_engine(ASYNC_DB_URL, echo=True)
-async_session = sessionmaker(
-    autocommit=False, autoflush=False, bind=async_engine, class_=AsyncSession
-)
+_BREAKER_KEY = "circuit_breaker"
+_ACQUIRED_KEY = "circuit_breaker_acquired"
+_PROBE_KEY = "circuit_breaker_probe"
+
+async_engine: Optional[AsyncEngine] = None
+circuit_breaker: Optional[CircuitBreaker] = None
+async_session = sessionmaker(autocommit=False, autoflush=False, class_=AsyncSession)
 
 Base = declarative_base()
 
 
+def init_engine(settings: Settings) -> AsyncEngine:
+    """
+    設定から非同期エンジンを生成し、async_session に紐付ける。
+
+    Args:
+        settings (Settings): アプリケーション設定
+
+    Returns:
+        AsyncEngine: 生成した非同期エンジン
+    """
+    global async_engine, circuit_breaker  # pylint: disable=global-statement
+
+    engine = create_async_engine(
+        settings.db_url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    if engine.dialect.name == "sqlite":
+        _enable_sqlite_transactions(engine)
+    if engine.dialect.name == "mysql":
+        _set_mysql_lock_wait_timeout(engine, settings.db_lock_wait_timeout)
+    install_statement_deadlines(engine)
+
+    async_session.configure(bind=engine)
+    async_engine = engine
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=settings.circuit_failure_threshold,
+        slow_call_seconds=settings.circuit_slow_call_seconds,
+        open_seconds=settings.circuit_open_seconds,
+        half_open_probes=settings.circuit_half_open_probes,
+    )
+    return engine
+
+
+async def dispose_engine() -> None:
+    """
+    非同期エンジンの接続プールを破棄する。
+
+    Returns:
+        なし
+    """
+    global async_engine, circuit_breaker  # pylint: disable=global-statement
+
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+    circuit_breaker = None
+
+
+def _enable_sqlite_transactions(engine: AsyncEngine) -> None:
+    # pysqlite 既定のトランザクション制御では SAVEPOINT が外側のトランザクションに
+    # 含まれないため、BEGIN を SQLAlchemy から明示的に発行する
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def _set_mysql_lock_wait_timeout(engine: AsyncEngine, seconds: int) -> None:
+    # MAX_EXECUTION_TIME は SELECT にしか効かないため、更新系の行ロック待ちはセッション単位で制限する
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_lock_wait_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET SESSION innodb_lock_wait_timeout = {int(seconds)}")
+        cursor.close()
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _acquire_circuit(session, transaction):
+    # 実際に DB を使うときだけ判定し、スナップショットから返す読み取りは遮断しない
+    breaker = session.info.get(_BREAKER_KEY)
+    if breaker is not None and not session.info.get(_ACQUIRED_KEY):
+        session.info[_PROBE_KEY] = breaker.acquire()
+        session.info[_ACQUIRED_KEY] = True
+
+
 async def get_db():
     """
     非同期データベースセッションを取得するコルーチン。
@@ -39,6 +138,44 @@ async def get_db():
     例:
         async with get_db() as session:
             # session を使って DB 操作を行う
+
+    注意:
+        DB 呼び出しの結果 (接続・実行エラー、期限切れ、SQL の応答時間) を
+        サーキットブレーカーに記録する。一意制約違反や HTTP エラーは DB の失敗として数えない。
     """
     async with async_session() as session:
-        yield session
+        breaker = circuit_breaker
+        if breaker is None:
+            yield session
+            return
+
+        session.info[_BREAKER_KEY] = breaker
+        request_deadline = current_deadline()
+        failed: Optional[bool] = None
+        try:
+            yield session
+        except DeadlineExceededError:
+            # 実行途中の SQL が残っている可能性があるため、接続はプールに戻さず破棄する
+            await session.invalidate()
+            failed = True
+            raise
+        except (DBAPIError, PoolTimeoutError) as e:
+            failed = not isinstance(e, IntegrityError)
+            raise
+        except Exception:
+            failed = False
+            raise
+        else:
+            failed = False
+        finally:
+            if session.info.get(_ACQUIRED_KEY):
+                probe = session.info.get(_PROBE_KEY, False)
+                if failed is None:
+                    breaker.release(probe)
+                elif failed:
+                    breaker.record_failure(probe)
+                else:
+                    breaker.record_success(
+                        request_deadline.slowest_statement if request_deadline else 0.0,
+                        probe,
+                    )
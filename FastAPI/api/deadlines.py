@@ -0,0 +1,215 @@
+"""
+リクエスト期限モジュール。
+
+ルートごとの処理期限を設け、期限を DB 層まで伝播させる。
+
+- DeadlineRoute はルートの処理 (依存関係の解決からレスポンス生成まで) を期限付きで実行し、
+  期限を過ぎると処理中の await をキャンセルして DeadlineExceededError を送出する
+- 期限は設定の request_deadline を既定値とし、ルートごとに Depends(deadline(秒)) で上書きする
+  (create_app を使わず app.state.settings がない場合は Settings の既定値を使う)
+- MySQL では SELECT に残り時間を MAX_EXECUTION_TIME ヒントとして付与し、
+  キャンセル後もサーバ側で実行が続かないようにする
+- 実行した SQL のうち最も遅いものの時間を記録し、get_db のサーキットブレーカーが参照する
+
+クラス:
+    - RequestDeadline: リクエストの期限と実行した SQL の最大応答時間
+    - DeadlineRoute: ルートの処理を期限付きで実行する APIRoute
+
+定数:
+    - LOOKUP_DEADLINE_SECONDS: ID 指定の取得など、1 件を引くルートの期限
+    - WRITE_DEADLINE_SECONDS: 作成・更新・削除ルートの期限
+
+関数:
+    - deadline: ルートの期限を設定する依存関数を生成する
+    - current_deadline: 現在のリクエストの期限を返す
+    - install_statement_deadlines: 期限を SQL に反映するイベントをエンジンに登録する
+
+例:
+    router = APIRouter(route_class=DeadlineRoute)
+
+    @router.get("/books/{book_id}", dependencies=[Depends(deadline(2.0))])
+    async def get_book(book_id: str):
+        ...
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from api.exceptions import DeadlineExceededError
+from api.settings import Settings
+
+LOOKUP_DEADLINE_SECONDS = 2.0
+WRITE_DEADLINE_SECONDS = 5.0
+DEFAULT_DEADLINE_SECONDS: float = Settings.model_fields["request_deadline"].default
+
+_STARTED_KEY = "deadline_statement_started"
+
+
+class RequestDeadline:
+    """
+    リクエストの期限と実行した SQL の最大応答時間。
+    """
+
+    __slots__ = ("timeout", "slowest_statement", "_loop")
+
+    def __init__(self, timeout: asyncio.Timeout) -> None:
+        self.timeout = timeout
+        self.slowest_statement = 0.0
+        self._loop = asyncio.get_running_loop()
+
+    def reschedule(self, seconds: Optional[float]) -> None:
+        """
+        期限を現在から seconds 秒後に設定し直す。
+
+        Args:
+            seconds (Optional[float]): 期限までの秒数 (None なら期限なし)
+
+        Returns:
+            なし
+        """
+        when = None if seconds is None else self._loop.time() + seconds
+        self.timeout.reschedule(when)
+
+    def remaining(self) -> Optional[float]:
+        """
+        期限までの残り秒数を返す。
+
+        Returns:
+            Optional[float]: 残り秒数 (期限なしの場合は None)
+        """
+        when = self.timeout.when()
+        return None if when is None else when - self._loop.time()
+
+    def expired(self) -> bool:
+        """
+        期限切れでキャンセルされたかを返す。
+
+        Returns:
+            bool: 期限切れの場合は True
+        """
+        return self.timeout.expired()
+
+
+_current_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[RequestDeadline]:
+    """
+    現在のリクエストの期限を返す。
+
+    Returns:
+        Optional[RequestDeadline]: 期限 (DeadlineRoute の外では None)
+    """
+    return _current_deadline.get()
+
+
+def deadline(seconds: float) -> Callable[[], Awaitable[None]]:
+    """
+    ルートの期限を設定する依存関数を生成する。
+
+    ルートの dependencies に指定すると、エンドポイントの引数の依存関係
+    (get_db を含む) より先に解決される。
+
+    Args:
+        seconds (float): 期限までの秒数
+
+    Returns:
+        Callable[[], Awaitable[None]]: 期限を設定する依存関数
+    """
+
+    async def set_deadline() -> None:
+        current = _current_deadline.get()
+        if current is not None:
+            current.reschedule(seconds)
+
+    return set_deadline
+
+
+class DeadlineRoute(APIRoute):
+    """
+    ルートの処理を期限付きで実行する APIRoute。
+
+    期限の既定値は設定の request_deadline を使う。
+    app.state.settings がない場合 (create_app を使わずにルーターを登録した場合) は
+    DEFAULT_DEADLINE_SECONDS を使う。
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+
+        async def handler_with_deadline(request: Request) -> Response:
+            request_deadline = None
+            reset_token = None
+            try:
+                async with asyncio.timeout(None) as timeout:
+                    request_deadline = RequestDeadline(timeout)
+                    settings = getattr(request.app.state, "settings", None)
+                    request_deadline.reschedule(
+                        DEFAULT_DEADLINE_SECONDS
+                        if settings is None
+                        else settings.request_deadline
+                    )
+                    reset_token = _current_deadline.set(request_deadline)
+                    return await handler(request)
+            except TimeoutError as e:
+                if request_deadline is None or not request_deadline.expired():
+                    raise
+                raise DeadlineExceededError("request deadline exceeded") from e
+            finally:
+                if reset_token is not None:
+                    _current_deadline.reset(reset_token)
+
+        return handler_with_deadline
+
+
+def install_statement_deadlines(engine: AsyncEngine) -> None:
+    """
+    リクエストの期限を SQL に反映するイベントをエンジンに登録する。
+
+    期限付きのリクエストで実行する SQL について応答時間を記録し、
+    MySQL では SELECT に残り時間を MAX_EXECUTION_TIME ヒント (ミリ秒) として付与する。
+
+    Args:
+        engine (AsyncEngine): 対象の非同期エンジン
+
+    Returns:
+        なし
+    """
+    add_hint = engine.dialect.name == "mysql"
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute", retval=True)
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        request_deadline = _current_deadline.get()
+        if request_deadline is None:
+            return statement, parameters
+        conn.info[_STARTED_KEY] = time.perf_counter()
+        if add_hint and statement[:6].upper() == "SELECT":
+            remaining = request_deadline.remaining()
+            if remaining is not None:
+                milliseconds = max(int(remaining * 1000), 1)
+                statement = (
+                    f"SELECT /*+ MAX_EXECUTION_TIME({milliseconds}) */{statement[6:]}"
+                )
+        return statement, parameters
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        request_deadline = _current_deadline.get()
+        started = conn.info.pop(_STARTED_KEY, None)
+        if request_deadline is None or started is None:
+            return
+        request_deadline.slowest_statement = max(
+            request_deadline.slowest_statement, time.perf_counter() - started
+        )
@@ -1 +1,4 @@
+from .db_exceptions import CircuitOpenError, DeadlineExceededError
+from .field_exceptions import UnknownFieldError
 from .integrity_exceptions import IntegrityViolationError
+from .version_exceptions import VersionConflictError
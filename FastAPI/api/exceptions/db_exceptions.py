@@ -0,0 +1,8 @@
+class DeadlineExceededError(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("database circuit is open")
+        self.retry_after = retry_after
@@ -0,0 +1,2 @@
+class UnknownFieldError(Exception):
+    pass
@@ -0,0 +1,2 @@
+class VersionConflictError(Exception):
+    pass
@@ -0,0 +1,88 @@
+"""
+変更履歴ジョブモジュール。
+
+変更履歴 (changes テーブル) を使ってインメモリスナップショットを差分更新するジョブと、
+古い変更履歴を削除するジョブを提供する。
+
+関数:
+    - refresh_snapshot_periodically: 一定間隔でスナップショットを差分更新し続ける
+    - prune_changes_periodically: 一定間隔で古い変更履歴を削除し続ける
+
+例:
+    import asyncio
+    from api.db import async_session
+    from api.jobs.changes import refresh_snapshot_periodically
+
+    task = asyncio.create_task(
+        refresh_snapshot_periodically(snapshot, async_session, interval=5)
+    )
+"""
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cruds.change import prune_changes
+from api.snapshot import CatalogueSnapshot
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_snapshot_periodically(
+    snapshot: CatalogueSnapshot,
+    session_factory: Callable[[], AsyncSession],
+    interval: float,
+) -> None:
+    """
+    一定間隔でスナップショットを差分更新し続ける。
+
+    1 回の失敗でジョブ全体を止めないよう、例外はログに記録して次回に持ち越す。
+
+    Args:
+        snapshot (CatalogueSnapshot): 更新するスナップショット
+        session_factory (Callable[[], AsyncSession]): セッションを生成するファクトリ
+        interval (float): 実行間隔 (秒)
+
+    Returns:
+        なし
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                await snapshot.refresh(session)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "snapshot refresh failed",
+                extra={"job": "snapshot", "seq": snapshot.seq},
+            )
+
+
+async def prune_changes_periodically(
+    session_factory: Callable[[], AsyncSession],
+    keep: int,
+    interval: float = PRUNE_INTERVAL_SECONDS,
+) -> None:
+    """
+    一定間隔で古い変更履歴を削除し続ける。
+
+    削除された範囲を参照していたスナップショットは、次回の差分更新で全件を読み直す。
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): セッションを生成するファクトリ
+        keep (int): 保持する変更履歴の件数
+        interval (float): 実行間隔 (秒)
+
+    Returns:
+        なし
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                await prune_changes(session, keep=keep)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("change pruning failed", extra={"job": "changes"})
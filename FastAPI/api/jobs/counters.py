@@ -0,0 +1,82 @@
+"""
+件数カウンタ再計算ジョブモジュール。
+
+authors.book_count と counters テーブルを実テーブルの件数で定期的に補正する。
+通常はアプリケーション起動時にバックグラウンドタスクとして起動し、
+単発で実行する場合は `python -m api.jobs.counters` を使う。
+
+関数:
+    - reconcile_once: カウンタを 1 回再計算する
+    - reconcile_periodically: 一定間隔でカウンタを再計算し続ける
+
+例:
+    import asyncio
+    from api.db import async_session
+    from api.jobs.counters import reconcile_periodically
+
+    task = asyncio.create_task(reconcile_periodically(async_session, interval=300))
+"""
+import asyncio
+import logging
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cruds.counter import reconcile_counters
+
+RECONCILE_INTERVAL_SECONDS = 300
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_once(session_factory: Callable[[], AsyncSession]) -> None:
+    """
+    カウンタを 1 回再計算する。
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): セッションを生成するファクトリ
+
+    Returns:
+        なし
+    """
+    async with session_factory() as session:
+        await reconcile_counters(session)
+
+
+async def reconcile_periodically(
+    session_factory: Callable[[], AsyncSession],
+    interval: float = RECONCILE_INTERVAL_SECONDS,
+) -> None:
+    """
+    一定間隔でカウンタを再計算し続ける。
+
+    1 回の失敗でジョブ全体を止めないよう、例外はログに記録して次回に持ち越す。
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): セッションを生成するファクトリ
+        interval (float): 実行間隔 (秒)
+
+    Returns:
+        なし
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_once(session_factory)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("counter reconciliation failed", extra={"job": "counters"})
+
+
+async def _main() -> None:
+    from api.db import async_session, dispose_engine, init_engine
+    from api.settings import Settings
+
+    init_engine(Settings.from_env())
+    try:
+        await reconcile_once(async_session)
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
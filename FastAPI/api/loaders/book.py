@@ -0,0 +1,151 @@
+"""
+書籍バッチローダーモジュール。
+
+DataLoader 方式で書籍の ID 検索をまとめるローダーを提供する。
+同じイベントループの 1 tick 内に要求された ID を集約し、
+WHERE id IN (...) の 1 クエリ (大きなバッチはチャンク分割) で取得する。
+
+クラス:
+    - BookLoader: リクエスト単位の書籍バッチローダー
+
+利用方法:
+    - リクエストごとに BookLoader を生成する (結果はリクエスト内でキャッシュされる)
+    - load / load_many で書籍を取得する
+    - リクエスト終了時に aclose で実行中のクエリを取り消す
+
+例:
+    loader = BookLoader(db, fields=("id", "title"))
+
+    # 同時に発行された load は 1 クエリにまとめられる
+    first, second = await asyncio.gather(
+        loader.load("550e8400-e29b-41d4-a716-446655440000"),
+        loader.load("660e8400-e29b-41d4-a716-446655440001"),
+    )
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.book as book_crud
+import api.schemas.book as book_schema
+
+MAX_BATCH_SIZE = 500
+
+
+class BookLoader:
+    """
+    リクエスト単位の書籍バッチローダー。
+
+    属性:
+        fields (Optional[Sequence[str]]): 返却するフィールド名 (None なら全フィールド)
+        max_batch_size (int): 1 クエリの IN 句に含める ID の最大数
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        fields: Optional[Sequence[str]] = None,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ) -> None:
+        self.fields = fields
+        self.max_batch_size = max_batch_size
+        self._db = db
+        # 結果を ID で突き合わせるため、id は常に SELECT する
+        requested = fields or book_schema.BOOK_FIELDS
+        self._columns = tuple(
+            name
+            for name in book_schema.BOOK_FIELDS
+            if name == "id" or name in requested
+        )
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._queue: List[str] = []
+        self._tasks: Set[asyncio.Task] = set()
+        self._dispatch_handle: Optional[asyncio.Handle] = None
+        # AsyncSession は同時に複数のクエリを実行できないため直列化する
+        self._lock = asyncio.Lock()
+
+    async def load(self, book_id: str) -> Optional[Dict[str, Any]]:
+        """
+        書籍を 1 件取得する。
+
+        Args:
+            book_id (str): 取得する書籍 ID (UUID)
+
+        Returns:
+            Optional[Dict[str, Any]]: 書籍データ (未検出なら None)
+        """
+        future = self._futures.get(book_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[book_id] = future
+            if not self._queue:
+                self._dispatch_handle = loop.call_soon(self._dispatch)
+            self._queue.append(book_id)
+        # 呼び出し元のキャンセルが他の待機者と共有する Future に波及しないようにする
+        return await asyncio.shield(future)
+
+    async def load_many(
+        self, book_ids: Sequence[str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        複数の書籍を取得する。
+
+        Args:
+            book_ids (Sequence[str]): 取得する書籍 ID (UUID) の一覧
+
+        Returns:
+            List[Optional[Dict[str, Any]]]: book_ids と同じ順序の書籍データ (未検出なら None)
+        """
+        return list(await asyncio.gather(*(self.load(book_id) for book_id in book_ids)))
+
+    async def aclose(self) -> None:
+        """
+        実行中・実行待ちのクエリを取り消し、終了を待つ。
+
+        load の呼び出し元がキャンセルされても共有のクエリは別タスクで続くため、
+        セッションを閉じる前 (依存関係の終了処理) に呼び出す。
+
+        Returns:
+            なし
+        """
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+        self._queue = []
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for future in self._futures.values():
+            future.cancel()
+
+    def _dispatch(self) -> None:
+        self._dispatch_handle = None
+        batch, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._fetch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: List[str]) -> None:
+        async with self._lock:
+            for start in range(0, len(batch), self.max_batch_size):
+                chunk = batch[start : start + self.max_batch_size]
+                try:
+                    rows = await book_crud.get_books_by_ids(
+                        self._db, book_ids=chunk, fields=self._columns
+                    )
+                except Exception as e:  # pylint: disable=broad-except
+                    for book_id in batch[start:]:
+                        self._futures[book_id].set_exception(e)
+                    return
+
+                found = {row["id"]: self._project(row) for row in rows}
+                for book_id in chunk:
+                    self._futures[book_id].set_result(found.get(book_id))
+
+    def _project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fields is None:
+            return row
+        return {name: row[name] for name in self.fields}
@@ -1,14 +1,212 @@
 """
 FastAPI アプリケーションのエントリポイント。
 
-著者と書籍のルーターを登録してアプリケーションを構成する。
+create_app で著者と書籍のルーターを登録してアプリケーションを構成する。
+プロファイリングを有効にした場合は、プロファイリングミドルウェアとデバッグ用ルートも登録する。
+リクエストの期限切れは 504、DB のサーキットブレーカーによる拒否は 503 に変換する。
+レスポンスは Accept-Encoding に応じて圧縮し、スナップショットモードでは圧縮済みの一覧を
+スナップショットの世代ごとにキャッシュする。
+lifespan では起動時に DB エンジンを生成して接続プールと SQL のコンパイル済みキャッシュを温め、
+件数カウンタの再計算ジョブと変更履歴の削除ジョブをバックグラウンドで開始する。
+スナップショットモードではカタログを読み込んで差分更新ジョブも開始する。
+終了時にはジョブを停止し、エンジンを破棄する。
+
+例:
+    # uvicorn api.main:app または uvicorn --factory api.main:create_app
+    app = create_app(Settings(db_url="mysql+aiomysql://root@db:3306/prod?charset=utf8"))
 """
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from typing import AsyncIterator, List, Optional
+
+import starlette.status
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from api.db import async_session, dispose_engine, init_engine
+from api.exceptions import CircuitOpenError, DeadlineExceededError
+from api.jobs.changes import prune_changes_periodically, refresh_snapshot_periodically
+from api.jobs.counters import reconcile_periodically
+from api.middlewares.compression import CompressedResponseCache, CompressionMiddleware
+from api.middlewares.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    install_db_timing,
+)
+from api.routers import author, book, debug
+from api.settings import Settings
+from api.snapshot import CatalogueSnapshot
+from api.warmup import open_pool_connections, warm_statement_cache
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    アプリケーションの起動・終了処理。
+
+    Args:
+        app (FastAPI): FastAPI アプリケーション
+
+    Returns:
+        AsyncIterator[None]: 起動処理完了後に制御を返すイテレータ
+    """
+    settings: Settings = app.state.settings
+    started = time.perf_counter()
+    engine = init_engine(settings)
+    tasks: List[asyncio.Task] = []
+    try:
+        await open_pool_connections(
+            engine, count=min(settings.warmup_connections, settings.db_pool_size)
+        )
+        if settings.warmup_statements:
+            await warm_statement_cache(engine, include_writes=settings.warmup_writes)
+
+        if settings.snapshot_enabled:
+            snapshot = CatalogueSnapshot()
+            async with async_session() as session:
+                await snapshot.load(session)
+            app.state.snapshot = snapshot
+            tasks.append(
+                asyncio.create_task(
+                    refresh_snapshot_periodically(
+                        snapshot,
+                        async_session,
+                        interval=settings.snapshot_refresh_interval,
+                    )
+                )
+            )
+        if settings.counter_reconcile_enabled:
+            tasks.append(
+                asyncio.create_task(
+                    reconcile_periodically(
+                        async_session, interval=settings.counter_reconcile_interval
+                    )
+                )
+            )
+        tasks.append(
+            asyncio.create_task(
+                prune_changes_periodically(
+                    async_session, keep=settings.change_retention
+                )
+            )
+        )
+        logger.info(
+            "startup completed",
+            extra={"startup_seconds": round(time.perf_counter() - started, 3)},
+        )
+
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        app.state.snapshot = None
+        await dispose_engine()
+
+
+async def deadline_exceeded_handler(
+    request: Request, exc: DeadlineExceededError
+) -> JSONResponse:
+    """
+    リクエストの処理期限切れを 504 に変換する。
+
+    Args:
+        request (Request): リクエスト
+        exc (DeadlineExceededError): 期限切れ例外
+
+    Returns:
+        JSONResponse: 504 レスポンス
+    """
+    logger.warning(
+        "request deadline exceeded",
+        extra={"method": request.method, "path": request.url.path},
+    )
+    return JSONResponse(
+        status_code=starlette.status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "Request deadline exceeded"},
+    )
+
+
+async def circuit_open_handler(request: Request, exc: CircuitOpenError) -> JSONResponse:
+    """
+    サーキットブレーカーによる拒否を 503 に変換する。
+
+    Args:
+        request (Request): リクエスト
+        exc (CircuitOpenError): サーキットブレーカーの拒否例外
+
+    Returns:
+        JSONResponse: Retry-After ヘッダ付きの 503 レスポンス
+    """
+    return JSONResponse(
+        status_code=starlette.status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is unavailable"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    FastAPI アプリケーションを生成する。
+
+    DB への接続は行わず、接続やウォームアップは lifespan の起動処理で行う。
+    圧縮ミドルウェアはプロファイリングミドルウェアの内側に置き、圧縮の時間もプロファイルに含める。
+    プロファイリングが有効な場合のみ、プロファイリングミドルウェアとデバッグ用ルートを登録する。
+
+    Args:
+        settings (Optional[Settings]): アプリケーション設定 (None なら環境変数から読み込む)
+
+    Returns:
+        FastAPI: FastAPI アプリケーション
+    """
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings or Settings.from_env()
+    app.state.snapshot = None
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+    app.add_exception_handler(CircuitOpenError, circuit_open_handler)
+
+    app.include_router(author.router)
+    app.include_router(book.router)
+
+    settings = app.state.settings
+    if settings.compression_enabled:
+        cache = None
+        if settings.snapshot_enabled and settings.compression_cache_bytes:
 
-from fastapi import FastAPI
+            def snapshot_generation() -> Optional[int]:
+                snapshot = app.state.snapshot
+                return None if snapshot is None else snapshot.generation
 
-from api.routers import author, book
+            cache = CompressedResponseCache(
+                paths=frozenset({"/books", "/authors"}),
+                generation=snapshot_generation,
+                max_bytes=settings.compression_cache_bytes,
+            )
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            thread_min_size=settings.compression_thread_min_size,
+            cache=cache,
+        )
+    if settings.profiling_enabled:
+        store = ProfileStore(settings.profiling_dir, settings.profiling_max_files)
+        app.state.profile_store = store
+        install_db_timing()
+        app.add_middleware(
+            ProfilingMiddleware,
+            store=store,
+            token=settings.profiling_token,
+            sample_rate=settings.profiling_sample_rate,
+        )
+        app.include_router(debug.router)
+    return app
 
-app = FastAPI()
 
-app.include_router(author.router)
-app.include_router(book.router)
+app = create_app()
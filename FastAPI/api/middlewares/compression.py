@@ -0,0 +1,419 @@
+"""
+レスポンス圧縮ミドルウェアモジュール。
+
+Accept-Encoding に応じて JSON などのテキスト系レスポンスを圧縮する。
+gzip は常に、zstd (zstandard) と br (brotli) はパッケージが導入されている場合のみ使う。
+
+- 本文が minimum_size 未満の単発レスポンスは圧縮しない
+- 本文が thread_min_size 以上の単発レスポンスは、イベントループを止めないよう
+  asyncio.to_thread で別スレッドで圧縮する (zlib / brotli / zstd は圧縮中に GIL を解放する)
+- ストリーミングレスポンスはチャンクごとに逐次圧縮してフラッシュし、全体をバッファしない
+- Content-Encoding が設定済みのレスポンスはそのまま返す
+- 圧縮対象のレスポンスには Vary: Accept-Encoding を付与する
+- CompressedResponseCache を指定すると、スナップショットから返す一覧のように
+  世代番号が同じ間は内容が変わらないレスポンスの圧縮結果を再利用する
+
+クラス:
+    - CompressedResponseCache: 圧縮済みレスポンスの LRU キャッシュ
+    - CompressionMiddleware: レスポンスを圧縮する ASGI ミドルウェア
+
+関数:
+    - available_encodings: 利用可能なエンコーディングを優先順に返す
+    - select_encoding: Accept-Encoding ヘッダからエンコーディングを選ぶ
+    - new_compressor: エンコーディングの逐次圧縮器を生成する
+
+例:
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+"""
+import asyncio
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 依存パッケージの有無による
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 依存パッケージの有無による
+    brotli = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 4
+
+# これ以上の本文は圧縮に数 ms 以上かかるため、別スレッドで圧縮する
+THREAD_MIN_SIZE = 256 * 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+_RawHeaders = List[Tuple[bytes, bytes]]
+
+
+# 各圧縮器は compress / sync_flush / flush をそろえる。sync_flush はそれまでの入力を
+# すべて出力し、受信側がストリームの途中までを伸長できるようにする
+class _GzipCompressor:
+    __slots__ = ("_compressor",)
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync_flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdCompressor:
+    __slots__ = ("_compressor",)
+
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync_flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    __slots__ = ("_compressor",)
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def sync_flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+_COMPRESSORS: Dict[str, Callable] = {"gzip": _GzipCompressor}
+if zstandard is not None:
+    _COMPRESSORS["zstd"] = _ZstdCompressor
+if brotli is not None:
+    _COMPRESSORS["br"] = _BrotliCompressor
+
+# 同じ q 値のときは圧縮率と速度のバランスがよい順に選ぶ
+_PREFERENCE = ("zstd", "br", "gzip")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """
+    利用可能なエンコーディングを優先順に返す。
+
+    Returns:
+        Tuple[str, ...]: エンコーディング名 (例: ("zstd", "gzip"))
+    """
+    return tuple(name for name in _PREFERENCE if name in _COMPRESSORS)
+
+
+def select_encoding(accept_encoding: str, encodings: Tuple[str, ...]) -> Optional[str]:
+    """
+    Accept-Encoding ヘッダからエンコーディングを選ぶ。
+
+    q 値が最も大きいものを選び、同じ q 値なら encodings の順を優先する。
+    q=0 のエンコーディングは選ばない。
+
+    Args:
+        accept_encoding (str): Accept-Encoding ヘッダ値
+        encodings (Tuple[str, ...]): 利用可能なエンコーディング (優先順)
+
+    Returns:
+        Optional[str]: 選んだエンコーディング (該当なしなら None)
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for name in encodings:
+        weight = weights.get(name, wildcard)
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+def new_compressor(encoding: str):
+    """
+    エンコーディングの逐次圧縮器を生成する。
+
+    Args:
+        encoding (str): エンコーディング名
+
+    Returns:
+        compress(bytes)、sync_flush() (途中までを出力)、flush() (終端を出力) を持つ圧縮器
+    """
+    return _COMPRESSORS[encoding]()
+
+
+class CompressedResponseCache:
+    """
+    圧縮済みレスポンスの LRU キャッシュ。
+
+    paths に含まれるパスへの GET について、(パス, クエリ文字列, エンコーディング) ごとに
+    ステータス・ヘッダ・圧縮済み本文を保持する。
+    generation が返す世代番号が変わると全件を破棄し、None の間はキャッシュしない。
+    """
+
+    def __init__(
+        self,
+        paths: FrozenSet[str],
+        generation: Callable[[], Optional[int]],
+        max_bytes: int,
+    ) -> None:
+        self.paths = paths
+        self.generation = generation
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Tuple[int, _RawHeaders, bytes]]" = (
+            OrderedDict()
+        )
+        self._generation: Optional[int] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, key: tuple, generation: int
+    ) -> Optional[Tuple[int, _RawHeaders, bytes]]:
+        """
+        キャッシュされたレスポンスを返す。
+
+        Args:
+            key (tuple): キャッシュキー
+            generation (int): 現在の世代番号
+
+        Returns:
+            Optional[Tuple[int, _RawHeaders, bytes]]: ステータス・ヘッダ・本文 (なければ None)
+        """
+        self._sync(generation)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: tuple,
+        generation: int,
+        status: int,
+        headers: _RawHeaders,
+        body: bytes,
+    ) -> None:
+        """
+        レスポンスをキャッシュし、上限を超えた分を古い順に破棄する。
+
+        Args:
+            key (tuple): キャッシュキー
+            generation (int): レスポンスを生成したときの世代番号
+            status (int): ステータスコード
+            headers (_RawHeaders): レスポンスヘッダ
+            body (bytes): 圧縮済み本文
+
+        Returns:
+            なし
+        """
+        if len(body) > self.max_bytes:
+            return
+        self._sync(generation)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous[2])
+        self._entries[key] = (status, headers, body)
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _sync(self, generation: int) -> None:
+        if generation != self._generation:
+            self._entries.clear()
+            self._size = 0
+            self._generation = generation
+
+
+class CompressionMiddleware:
+    """
+    レスポンスを圧縮する ASGI ミドルウェア。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: Optional[CompressedResponseCache] = None,
+        thread_min_size: int = THREAD_MIN_SIZE,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.thread_min_size = thread_min_size
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        responder = _CompressionResponder(
+            self.app, encoding, self.minimum_size, self.thread_min_size
+        )
+
+        if (
+            encoding is not None
+            and self.cache is not None
+            and scope["method"] == "GET"
+            and scope["path"] in self.cache.paths
+        ):
+            generation = self.cache.generation()
+            if generation is not None:
+                key = (scope["path"], scope["query_string"], encoding)
+                entry = self.cache.get(key, generation)
+                if entry is not None:
+                    status, headers, body = entry
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": status,
+                            "headers": list(headers),
+                        }
+                    )
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                responder.cache_entry = (self.cache, key, generation)
+
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    # リクエストごとに生成し、最初の本文を見て圧縮するかを決める
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoding: Optional[str],
+        minimum_size: int,
+        thread_min_size: int,
+    ):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+        self.cache_entry: Optional[Tuple[CompressedResponseCache, tuple, int]] = None
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 本文の大きさと分割の有無を見てから決めるため、ヘッダの送信を保留する
+            self.start_message = message
+            return
+        if message_type != "http.response.body" or self.started:
+            if self.compressor is not None and message_type == "http.response.body":
+                message = self._compress_chunk(message)
+            await self.send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        start = {**self.start_message, "headers": headers.raw}
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._compressible(start["status"], headers) or (
+            not more_body and len(body) < self.minimum_size
+        ):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None:
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        self.compressor = new_compressor(self.encoding)
+        if more_body:
+            del headers["Content-Length"]
+            await self.send(start)
+            await self.send(self._compress_chunk(message))
+            return
+
+        if len(body) >= self.thread_min_size:
+            compressed = await asyncio.to_thread(self._compress_body, body)
+        else:
+            compressed = self._compress_body(body)
+        headers["Content-Length"] = str(len(compressed))
+        if self.cache_entry is not None and start["status"] == 200:
+            cache, key, generation = self.cache_entry
+            # 処理中に世代が進んだ場合は、どちらの世代の内容か分からないためキャッシュしない
+            if cache.generation() == generation:
+                cache.put(
+                    key, generation, start["status"], list(headers.raw), compressed
+                )
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    def _compressible(self, status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith(
+            "+json"
+        )
+
+    def _compress_body(self, body: bytes) -> bytes:
+        return self.compressor.compress(body) + self.compressor.flush()
+
+    def _compress_chunk(self, message: Message) -> Message:
+        chunk = self.compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        # 圧縮器の内部バッファに留めず、受け取ったチャンクはその場でクライアントへ届ける
+        if more_body:
+            chunk += self.compressor.sync_flush()
+        else:
+            chunk += self.compressor.flush()
+        return {"type": "http.response.body", "body": chunk, "more_body": more_body}
@@ -0,0 +1,285 @@
+"""
+プロファイリングミドルウェアモジュール。
+
+設定で有効にした場合に限り、X-Profile-Token ヘッダで認証されたリクエスト、
+またはサンプリングで選ばれたリクエストを 1 件ずつプロファイルする。
+ルーター → CRUD → SQLAlchemy の呼び出しを cProfile で記録し、
+SQLAlchemy のカーソルイベントで DB 待ち時間を計測して、
+イベントループ上の時間 (wall - DB 待ち) と分けて要約する。
+プロファイルはディレクトリ内のリングに書き出し、上限を超えた古いものから削除する。
+
+クラス:
+    - DbTimer: リクエスト中の DB 待ち時間を集計する
+    - ProfileStore: プロファイルを上限件数のリングとしてディスクに保存する
+    - ProfilingMiddleware: 対象リクエストをプロファイルする ASGI ミドルウェア
+
+関数:
+    - install_db_timing: DB 待ち時間を計測するイベントを登録する
+
+利用方法:
+    - create_app で profiling_enabled が有効な場合にのみ登録する
+    - 対象外のリクエストはヘッダ照合 (とサンプリング判定) のみでそのまま下流へ渡す
+
+例:
+    store = ProfileStore("/tmp/books-api-profiles", max_files=50)
+    install_db_timing()
+    app.add_middleware(ProfilingMiddleware, store=store, token="...", sample_rate=0.01)
+"""
+import asyncio
+import cProfile
+import datetime
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_PROFILE_ID_PATTERN = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+_STARTED_KEY = "profiling_started"
+
+logger = logging.getLogger(__name__)
+
+
+class DbTimer:
+    """
+    リクエスト中の DB 待ち時間を集計する。
+    """
+
+    __slots__ = ("seconds", "statements")
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.statements = 0
+
+
+_current_timer: ContextVar[Optional[DbTimer]] = ContextVar(
+    "profiling_db_timer", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_timer.get() is not None:
+        conn.info[_STARTED_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timer = _current_timer.get()
+    started = conn.info.pop(_STARTED_KEY, None)
+    if timer is None or started is None:
+        return
+    timer.seconds += time.perf_counter() - started
+    timer.statements += 1
+
+
+def install_db_timing() -> None:
+    """
+    DB 待ち時間を計測するカーソルイベントを全エンジンに登録する。
+
+    プロファイル中のリクエスト以外では ContextVar を 1 回参照するだけで戻る。
+    複数回呼び出しても登録は 1 回のみ行う。
+
+    Returns:
+        なし
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ProfileStore:
+    """
+    プロファイルを上限件数のリングとしてディスクに保存する。
+
+    プロファイルごとに pstats 形式の <id>.prof と要約の <id>.json を書き出す。
+    ID は作成時刻から始まるため、ファイル名順が作成順になる。
+    """
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    @staticmethod
+    def new_id() -> str:
+        """
+        作成時刻順に並ぶプロファイル ID を生成する。
+
+        Returns:
+            str: プロファイル ID
+        """
+        return f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+
+    def save(
+        self, profile_id: str, summary: Dict[str, Any], profiler: cProfile.Profile
+    ) -> None:
+        """
+        プロファイルと要約を書き出し、上限を超えた古いプロファイルを削除する。
+
+        一覧に不完全なプロファイルが現れないよう、要約は最後に置き換えで書き出す。
+
+        Args:
+            profile_id (str): プロファイル ID
+            summary (Dict[str, Any]): 要約
+            profiler (cProfile.Profile): 記録済みのプロファイラ
+
+        Returns:
+            なし
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.directory / f"{profile_id}.prof")
+        tmp_path = self.directory / f"{profile_id}.json.tmp"
+        tmp_path.write_text(json.dumps(summary))
+        os.replace(tmp_path, self.directory / f"{profile_id}.json")
+        self._prune()
+
+    def _prune(self) -> None:
+        summaries = sorted(self.directory.glob("*.json"))
+        for path in summaries[: max(len(summaries) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def list_summaries(self) -> List[Dict[str, Any]]:
+        """
+        保存済みプロファイルの要約を新しい順に返す。
+
+        Returns:
+            List[Dict[str, Any]]: 要約のリスト
+        """
+        if not self.directory.is_dir():
+            return []
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                summaries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # 一覧取得中にリングから削除された
+                continue
+        return summaries
+
+    def profile_path(self, profile_id: str) -> Optional[Path]:
+        """
+        プロファイル ID に対応する pstats ファイルのパスを返す。
+
+        Args:
+            profile_id (str): プロファイル ID
+
+        Returns:
+            Optional[Path]: ファイルのパス (ID が不正、または存在しない場合は None)
+        """
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.prof"
+        return path if path.is_file() else None
+
+
+class ProfilingMiddleware:
+    """
+    対象リクエストをプロファイルする ASGI ミドルウェア。
+
+    cProfile はスレッド単位で 1 つしか動かせないため、同時に記録するのは 1 リクエストのみとし、
+    記録中に届いた対象リクエストはプロファイルせずに処理する。
+    記録中は同じイベントループ上の他のリクエストの関数呼び出しも混ざるが、
+    DB 待ち時間は ContextVar で対象リクエストの分だけを集計する。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self._token = token.encode() if token else None
+        self._token_header = PROFILE_TOKEN_HEADER.lower().encode()
+        self._sample_rate = sample_rate
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send, trigger)
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        if self._token is not None:
+            for name, value in scope["headers"]:
+                if name == self._token_header:
+                    if hmac.compare_digest(value, self._token):
+                        return "header"
+                    break
+        if self._sample_rate and random.random() < self._sample_rate:
+            return "sample"
+        return None
+
+    async def _profile(
+        self, scope: Scope, receive: Receive, send: Send, trigger: str
+    ) -> None:
+        profile_id = self.store.new_id()
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        timer = DbTimer()
+        reset_token = _current_timer.set(timer)
+        profiler = cProfile.Profile()
+        self._active = True
+        started_at = datetime.datetime.now(datetime.timezone.utc)
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            wall_seconds = time.perf_counter() - started
+            cpu_seconds = time.process_time() - cpu_started
+            self._active = False
+            _current_timer.reset(reset_token)
+
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "trigger": trigger,
+                "started_at": started_at.isoformat(),
+                "wall_ms": round(wall_seconds * 1000, 3),
+                "db_ms": round(timer.seconds * 1000, 3),
+                "loop_ms": round(max(wall_seconds - timer.seconds, 0.0) * 1000, 3),
+                "cpu_ms": round(cpu_seconds * 1000, 3),
+                "db_statements": timer.statements,
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, summary, profiler)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    "profile write failed",
+                    extra={"profile_id": profile_id, "path": scope["path"]},
+                )
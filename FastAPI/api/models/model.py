@@ -6,11 +6,13 @@ api.models.model モジュール
 
 - Author: 著者情報を表すデータベーステーブルのモデルクラス。
 - Book: 書籍情報を表すデータベーステーブルのモデルクラス。
+- Counter: 件数カウンタを表すデータベーステーブルのモデルクラス。
+- Change: 変更履歴 (変更シーケンス) を表すデータベーステーブルのモデルクラス。
 
 これらのクラスはデータベース内の異なるテーブルを表し、それぞれのテーブルに対する関連性も定義されています。
 """
 import uuid
-from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String, event
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 
@@ -24,6 +26,8 @@ class Author(Base):
     属性:
         id (str): 著者の一意の識別子 (UUID)。
         name (str): 著者名 (最大50文字)。
+        book_count (int): 著者の書籍数 (書籍の作成・削除と同一トランザクションで更新)。
+        version (int): 楽観的排他制御用のバージョン (更新ごとに 1 増える)。
         books (relationship): 著者が執筆した書籍との関連性。
     """
 
@@ -31,6 +35,8 @@ class Author(Base):
 
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(50), nullable=False)
+    book_count = Column(Integer, nullable=False, default=0, server_default="0")
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     books = relationship("Book", back_populates="author", cascade="delete")
 
@@ -43,6 +49,7 @@ class Book(Base):
         id (str): 書籍の一意の識別子 (UUID)。
         title (str): 書籍タイトル (最大100文字)。
         author_id (str): 著者の識別子 (UUID)。
+        version (int): 楽観的排他制御用のバージョン (更新ごとに 1 増える)。
         author (relationship): 書籍の著者との関連性。
     """
 
@@ -51,5 +58,58 @@ class Book(Base):
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(100), nullable=False)
     author_id = Column(CHAR(36), ForeignKey("authors.id"), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     author = relationship("Author", back_populates="books")
+
+
+class Counter(Base):
+    """
+    件数カウンタを表すデータベーステーブルのモデルクラスです。
+
+    COUNT(*) を使わずに総件数を返すため、作成・削除と同一トランザクションで更新します。
+
+    属性:
+        name (str): カウンタ名 (COUNTER_NAMES のいずれか)。
+        value (int): 現在の件数。
+    """
+
+    __tablename__ = "counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+COUNTER_NAMES = ("authors", "books")
+
+
+@event.listens_for(Counter.__table__, "after_create")
+def _seed_counters(target, connection, **kw):
+    """counters テーブル作成直後に各カウンタの行を 0 で作成する"""
+    connection.execute(
+        target.insert(), [{"name": name, "value": 0} for name in COUNTER_NAMES]
+    )
+
+
+class Change(Base):
+    """
+    変更履歴 (変更シーケンス) を表すデータベーステーブルのモデルクラスです。
+
+    作成・更新・削除と同一トランザクションで 1 行追加し、
+    インメモリスナップショットの差分更新に使用します。
+
+    属性:
+        seq (int): 変更シーケンス番号 (自動採番)。
+        table_name (str): 変更されたテーブル名 (authors / books)。
+        row_id (str): 変更された行の識別子 (UUID)。
+    """
+
+    __tablename__ = "changes"
+
+    seq = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    table_name = Column(String(20), nullable=False)
+    row_id = Column(CHAR(36), nullable=False)
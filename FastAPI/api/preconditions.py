@@ -0,0 +1,68 @@
+"""
+条件付きリクエストモジュール。
+
+バージョン列を使った楽観的排他制御のため、ETag の生成と
+If-Match ヘッダの解釈を行う。
+
+関数:
+    - format_etag: バージョンから ETag を生成する
+    - if_match_version: If-Match ヘッダを期待バージョンに変換する依存関数
+
+利用方法:
+    - 更新系ルートで Depends(if_match_version) を指定する
+    - レスポンスの ETag ヘッダに format_etag の値を設定する
+
+例:
+    @router.patch("/books/{book_id}")
+    async def update_book(book_id: str, version: Optional[int] = Depends(if_match_version)):
+        ...
+"""
+from typing import Optional
+
+import starlette.status
+from fastapi import Header, HTTPException
+
+
+def format_etag(version: int) -> str:
+    """
+    バージョンから強い ETag を生成する。
+
+    Args:
+        version (int): リソースのバージョン
+
+    Returns:
+        str: ETag ヘッダ値 (例: '"3"')
+    """
+    return f'"{version}"'
+
+
+async def if_match_version(
+    if_match: Optional[str] = Header(None, description='更新対象のバージョン (例: "3")。"*" は無条件更新')
+) -> Optional[int]:
+    """
+    If-Match ヘッダを期待バージョンに変換する。
+
+    Args:
+        if_match (Optional[str]): If-Match ヘッダ値
+
+    Returns:
+        Optional[int]: 期待バージョン ("*" の場合は None)
+
+    Raises:
+        HTTPException: ヘッダが欠落している、または形式が不正な場合
+    """
+    if if_match is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match header is required",
+        )
+
+    value = if_match.strip()
+    if value == "*":
+        return None
+    if len(value) >= 3 and value[0] == value[-1] == '"' and value[1:-1].isdigit():
+        return int(value[1:-1])
+    raise HTTPException(
+        status_code=starlette.status.HTTP_400_BAD_REQUEST,
+        detail="If-Match must be a single strong ETag or *",
+    )
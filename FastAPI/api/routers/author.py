@@ -7,8 +7,15 @@
     - router: 著者操作用の FastAPI APIRouter インスタンス
 
 ルート:
-    - GET /authors: 著者一覧取得
+    - GET /authors: 著者一覧取得 (?fields= で返却フィールドを限定可能)
+    - GET /authors/{author_id}/stats: 著者統計取得
     - POST /authors: 著者作成
+    - PATCH /authors/{author_id}: 著者部分更新 (If-Match 必須)
+
+一覧取得では X-Total-Count ヘッダに件数カウンタの値を返す。
+スナップショットモードでは、一覧取得を DB ではなくインメモリスナップショットから返す。
+各ルートは処理期限付きで実行し、期限を過ぎると 504 を返す
+(一覧は設定の既定値、統計取得と更新系はルートごとの期限)。
 
 利用方法:
     - router インスタンスをインポートする
@@ -23,26 +30,85 @@
 
     # これで著者ルートが利用可能になる
 """
-from typing import List
+from typing import List, Optional, Tuple
 
 import starlette.status
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import api.cruds.author as author_crud
+import api.cruds.counter as counter_crud
 import api.schemas.author as author_schema
 from api.db import get_db
-from api.exceptions import IntegrityViolationError
+from api.deadlines import (
+    LOOKUP_DEADLINE_SECONDS,
+    WRITE_DEADLINE_SECONDS,
+    DeadlineRoute,
+    deadline,
+)
+from api.exceptions import (
+    IntegrityViolationError,
+    UnknownFieldError,
+    VersionConflictError,
+)
+from api.preconditions import format_etag, if_match_version
+from api.schemas.fields import parse_fields
+from api.snapshot import CatalogueSnapshot, get_snapshot
+
+router = APIRouter(route_class=DeadlineRoute)
 
-router = APIRouter()
+
+async def author_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="返却するフィールドのカンマ区切り (例: id,name)",
+        examples=["id,name"],
+    )
+) -> Optional[Tuple[str, ...]]:
+    """
+    fields クエリパラメータを著者のフィールド名タプルに変換する。
+
+    Args:
+        fields (Optional[str]): カンマ区切りのフィールド名
+
+    Returns:
+        Optional[Tuple[str, ...]]: 要求されたフィールド名 (未指定なら None)
+
+    Raises:
+        HTTPException: 未知のフィールド名が指定された場合
+    """
+    try:
+        return parse_fields(fields, allowed=author_schema.AUTHOR_FIELDS)
+    except UnknownFieldError as e:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
 
 
 @router.get("/authors", response_model=List[author_schema.AuthorResponse])
-async def list_authors(db: AsyncSession = Depends(get_db)):
+async def list_authors(
+    response: Response,
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+    limit: Optional[int] = Query(None, ge=1, description="取得する最大件数"),
+    fields: Optional[Tuple[str, ...]] = Depends(author_fields),
+    snapshot: Optional[CatalogueSnapshot] = Depends(get_snapshot),
+    db: AsyncSession = Depends(get_db),
+):
     """
     著者一覧を取得する。
 
+    fields が指定された場合は該当カラムのみを SELECT し、
+    レスポンスもそのフィールドだけに絞り込む。
+    総件数は COUNT(*) ではなく件数カウンタから X-Total-Count ヘッダに設定する。
+
     Args:
+        response (Response): ヘッダ設定用のレスポンス
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
+        fields (Optional[Tuple[str, ...]]): 返却するフィールド名
+        snapshot (Optional[CatalogueSnapshot]): スナップショット (スナップショットモード時のみ)
         db (AsyncSession): 非同期 SQLAlchemy セッション
 
     Returns:
@@ -51,13 +117,58 @@ async def list_authors(db: AsyncSession = Depends(get_db)):
     Raises:
         HTTPException: 処理中にエラーが発生した場合
     """
-    return await author_crud.get_authors(db=db)
+    if snapshot is not None:
+        return Response(
+            content=snapshot.authors.page_json(offset, limit, fields),
+            media_type="application/json",
+            headers={"X-Total-Count": str(len(snapshot.authors))},
+        )
+
+    headers = {"X-Total-Count": str(await counter_crud.get_counter(db, name="authors"))}
+    if fields is None:
+        response.headers.update(headers)
+        return await author_crud.get_authors(db=db, offset=offset, limit=limit)
+    authors = await author_crud.get_authors_projection(
+        db=db, fields=fields, offset=offset, limit=limit
+    )
+    return JSONResponse(content=authors, headers=headers)
+
+
+@router.get(
+    "/authors/{author_id}/stats",
+    response_model=author_schema.AuthorStats,
+    dependencies=[Depends(deadline(LOOKUP_DEADLINE_SECONDS))],
+)
+async def get_author_stats(author_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    著者の統計情報を取得する。
+
+    書籍数は books を COUNT(*) せず、authors.book_count を返す。
+
+    Args:
+        author_id (str): 著者 ID (UUID)
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+
+    Returns:
+        author_schema.AuthorStats: 著者統計
+
+    Raises:
+        HTTPException: 著者が見つからない場合
+    """
+    book_count = await author_crud.get_author_book_count(db=db, author_id=author_id)
+    if book_count is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Author not found",
+        )
+    return author_schema.AuthorStats(author_id=author_id, book_count=book_count)
 
 
 @router.post(
     "/authors",
     response_model=author_schema.AuthorResponse,
     status_code=starlette.status.HTTP_201_CREATED,
+    dependencies=[Depends(deadline(WRITE_DEADLINE_SECONDS))],
 )
 async def create_author(
     author_body: author_schema.AuthorCreate, db: AsyncSession = Depends(get_db)
@@ -85,3 +196,57 @@ async def create_author(
             status_code=starlette.status.HTTP_400_BAD_REQUEST,
             detail="Failed to create author",
         ) from e
+
+
+@router.patch(
+    "/authors/{author_id}",
+    response_model=author_schema.AuthorResponse,
+    dependencies=[Depends(deadline(WRITE_DEADLINE_SECONDS))],
+)
+async def update_author(
+    author_id: str,
+    author_body: author_schema.AuthorUpdate,
+    response: Response,
+    version: Optional[int] = Depends(if_match_version),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    著者を部分更新する。
+
+    If-Match のバージョンと一致する場合のみ更新し、更新後のバージョンを ETag で返す。
+
+    Args:
+        author_id (str): 更新対象の著者 ID (UUID)
+        author_body (author_schema.AuthorUpdate): 著者更新リクエストボディ
+        response (Response): ヘッダ設定用のレスポンス
+        version (Optional[int]): If-Match で指定された期待バージョン
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+
+    Returns:
+        author_schema.AuthorResponse: 更新後の著者データ
+
+    Raises:
+        HTTPException: 著者が見つからない、バージョンが一致しない、または
+            更新内容が空の場合
+    """
+    if not author_body.model_fields_set:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
+        )
+    try:
+        author = await author_crud.update_author(
+            db=db, author_id=author_id, author_update=author_body, version=version
+        )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_412_PRECONDITION_FAILED,
+            detail="Author has been modified by another request",
+        ) from e
+    if author is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Author not found",
+        )
+    response.headers["ETag"] = format_etag(author.version)
+    return author
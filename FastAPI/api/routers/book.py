@@ -7,10 +7,18 @@
     - router: 書籍操作用の FastAPI APIRouter インスタンス
 
 ルート:
-    - GET /books: 書籍一覧取得
+    - GET /books: 書籍一覧取得 (?fields= で返却フィールドを限定可能、?ids= でバッチ取得)
+    - GET /books/{book_id}: 書籍取得
     - POST /books: 書籍作成
+    - PATCH /books/{book_id}: 書籍部分更新 (If-Match 必須)
     - DELETE /books/{book_id}: 書籍削除
 
+一覧取得では X-Total-Count ヘッダに件数を返す
+(全件取得時は件数カウンタ、ids 指定時は取得できた件数)。
+スナップショットモードでは、一覧取得と ID 検索を DB ではなくインメモリスナップショットから返す。
+各ルートは処理期限付きで実行し、期限を過ぎると 504 を返す
+(一覧は設定の既定値、ID 指定の取得と更新系はルートごとの期限)。
+
 利用方法:
     - router インスタンスをインポートする
     - FastAPI アプリにルーターを登録する
@@ -24,26 +32,154 @@
 
     # これで書籍ルートが利用可能になる
 """
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
 import starlette.status
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import api.cruds.book as book_crud
+import api.cruds.counter as counter_crud
 import api.schemas.book as book_schema
 from api.db import get_db
-from api.exceptions import IntegrityViolationError
+from api.deadlines import (
+    LOOKUP_DEADLINE_SECONDS,
+    WRITE_DEADLINE_SECONDS,
+    DeadlineRoute,
+    deadline,
+)
+from api.exceptions import (
+    IntegrityViolationError,
+    UnknownFieldError,
+    VersionConflictError,
+)
+from api.loaders.book import BookLoader
+from api.preconditions import format_etag, if_match_version
+from api.schemas.fields import parse_fields
+from api.snapshot import CatalogueSnapshot, get_snapshot
+
+MAX_IDS = 1000
+
+router = APIRouter(route_class=DeadlineRoute)
+
+
+async def book_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="返却するフィールドのカンマ区切り (例: id,title)",
+        examples=["id,title"],
+    )
+) -> Optional[Tuple[str, ...]]:
+    """
+    fields クエリパラメータを書籍のフィールド名タプルに変換する。
+
+    Args:
+        fields (Optional[str]): カンマ区切りのフィールド名
+
+    Returns:
+        Optional[Tuple[str, ...]]: 要求されたフィールド名 (未指定なら None)
+
+    Raises:
+        HTTPException: 未知のフィールド名が指定された場合
+    """
+    try:
+        return parse_fields(fields, allowed=book_schema.BOOK_FIELDS)
+    except UnknownFieldError as e:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+async def book_ids(
+    ids: Optional[str] = Query(
+        None,
+        description=f"取得する書籍 ID のカンマ区切り (最大 {MAX_IDS} 件)",
+    )
+) -> Optional[List[str]]:
+    """
+    ids クエリパラメータを書籍 ID のリストに変換する。
+
+    重複は最初の出現位置を残して取り除く。
+
+    Args:
+        ids (Optional[str]): カンマ区切りの書籍 ID
+
+    Returns:
+        Optional[List[str]]: 書籍 ID の一覧 (未指定なら None)
 
-router = APIRouter()
+    Raises:
+        HTTPException: ID が空、または上限を超えて指定された場合
+    """
+    if ids is None:
+        return None
+    parsed = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not parsed:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail="ids must not be empty",
+        )
+    if len(parsed) > MAX_IDS:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids (max {MAX_IDS})",
+        )
+    return parsed
+
+
+async def get_book_loader(
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncIterator[BookLoader]:
+    """
+    リクエスト単位の書籍バッチローダーを生成する。
+
+    リクエストの終了時 (期限切れによるキャンセルを含む) に、
+    セッションを閉じる前にローダーの実行中クエリを取り消す。
+
+    Args:
+        fields (Optional[Tuple[str, ...]]): 返却するフィールド名
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+
+    Yields:
+        BookLoader: 書籍バッチローダー
+    """
+    loader = BookLoader(db, fields=fields)
+    try:
+        yield loader
+    finally:
+        await loader.aclose()
 
 
 @router.get("/books", response_model=List[book_schema.BookResponse])
-async def list_books(db: AsyncSession = Depends(get_db)):
+async def list_books(
+    response: Response,
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+    limit: Optional[int] = Query(None, ge=1, description="取得する最大件数"),
+    ids: Optional[List[str]] = Depends(book_ids),
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
+    loader: BookLoader = Depends(get_book_loader),
+    snapshot: Optional[CatalogueSnapshot] = Depends(get_snapshot),
+    db: AsyncSession = Depends(get_db),
+):
     """
     書籍一覧を取得する。
 
+    fields が指定された場合は該当カラムのみを SELECT し、
+    レスポンスもそのフィールドだけに絞り込む。
+    ids が指定された場合はバッチローダー経由で該当書籍のみを要求順に返す
+    (存在しない ID は結果に含めない。offset / limit は適用しない)。
+    総件数は COUNT(*) ではなく件数カウンタから X-Total-Count ヘッダに設定する。
+
     Args:
+        response (Response): ヘッダ設定用のレスポンス
+        offset (int): 読み飛ばす件数
+        limit (Optional[int]): 取得する最大件数 (None なら全件)
+        ids (Optional[List[str]]): 取得する書籍 ID の一覧
+        fields (Optional[Tuple[str, ...]]): 返却するフィールド名
+        loader (BookLoader): 書籍バッチローダー
+        snapshot (Optional[CatalogueSnapshot]): スナップショット (スナップショットモード時のみ)
         db (AsyncSession): 非同期 SQLAlchemy セッション
 
     Returns:
@@ -52,13 +188,103 @@ async def list_books(db: AsyncSession = Depends(get_db)):
     Raises:
         HTTPException: 処理中にエラーが発生した場合
     """
-    return await book_crud.get_books(db=db)
+    if snapshot is not None:
+        if ids is not None:
+            records = [r for r in map(snapshot.books.get, ids) if r is not None]
+            total = len(records)
+        else:
+            records = snapshot.books.page(offset, limit)
+            total = len(snapshot.books)
+        return Response(
+            content=snapshot.books.records_json(records, fields),
+            media_type="application/json",
+            headers={"X-Total-Count": str(total)},
+        )
+
+    if ids is not None:
+        books = [book for book in await loader.load_many(ids) if book is not None]
+        total = len(books)
+    else:
+        total = await counter_crud.get_counter(db, name="books")
+        if fields is None:
+            books = await book_crud.get_books(db=db, offset=offset, limit=limit)
+        else:
+            books = await book_crud.get_books_projection(
+                db=db, fields=fields, offset=offset, limit=limit
+            )
+
+    headers = {"X-Total-Count": str(total)}
+    if fields is None:
+        response.headers.update(headers)
+        return books
+    return JSONResponse(content=books, headers=headers)
+
+
+@router.get(
+    "/books/{book_id}",
+    response_model=book_schema.BookResponse,
+    dependencies=[Depends(deadline(LOOKUP_DEADLINE_SECONDS))],
+)
+async def get_book(
+    book_id: str,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(book_fields),
+    loader: BookLoader = Depends(get_book_loader),
+    snapshot: Optional[CatalogueSnapshot] = Depends(get_snapshot),
+):
+    """
+    書籍を取得する。
+
+    バージョンを取得した場合は ETag ヘッダに設定する。
+
+    Args:
+        book_id (str): 取得する書籍 ID (UUID)
+        response (Response): ヘッダ設定用のレスポンス
+        fields (Optional[Tuple[str, ...]]): 返却するフィールド名
+        loader (BookLoader): 書籍バッチローダー
+        snapshot (Optional[CatalogueSnapshot]): スナップショット (スナップショットモード時のみ)
+
+    Returns:
+        book_schema.BookResponse: 書籍データ
+
+    Raises:
+        HTTPException: 書籍が見つからない場合
+    """
+    if snapshot is not None:
+        record = snapshot.books.get(book_id)
+        if record is None:
+            raise HTTPException(
+                status_code=starlette.status.HTTP_404_NOT_FOUND,
+                detail="Book not found",
+            )
+        headers = {}
+        if fields is None or "version" in fields:
+            headers["ETag"] = format_etag(record.version)
+        return Response(
+            content=snapshot.books.record_json(record, fields),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    book = await loader.load(book_id)
+    if book is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Book not found",
+        )
+
+    headers = {"ETag": format_etag(book["version"])} if "version" in book else {}
+    if fields is None:
+        response.headers.update(headers)
+        return book
+    return JSONResponse(content=book, headers=headers)
 
 
 @router.post(
     "/books",
     response_model=book_schema.BookResponse,
     status_code=starlette.status.HTTP_201_CREATED,
+    dependencies=[Depends(deadline(WRITE_DEADLINE_SECONDS))],
 )
 async def create_book(
     book_body: book_schema.BookCreate, db: AsyncSession = Depends(get_db)
@@ -86,7 +312,70 @@ async def create_book(
         ) from e
 
 
-@router.delete("/books/{book_id}", status_code=starlette.status.HTTP_204_NO_CONTENT)
+@router.patch(
+    "/books/{book_id}",
+    response_model=book_schema.BookResponse,
+    dependencies=[Depends(deadline(WRITE_DEADLINE_SECONDS))],
+)
+async def update_book(
+    book_id: str,
+    book_body: book_schema.BookUpdate,
+    response: Response,
+    version: Optional[int] = Depends(if_match_version),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    書籍を部分更新する。
+
+    If-Match のバージョンと一致する場合のみ更新し、更新後のバージョンを ETag で返す。
+
+    Args:
+        book_id (str): 更新対象の書籍 ID (UUID)
+        book_body (book_schema.BookUpdate): 書籍更新リクエストボディ
+        response (Response): ヘッダ設定用のレスポンス
+        version (Optional[int]): If-Match で指定された期待バージョン
+        db (AsyncSession): 非同期 SQLAlchemy セッション
+
+    Returns:
+        book_schema.BookResponse: 更新後の書籍データ
+
+    Raises:
+        HTTPException: 書籍が見つからない、バージョンが一致しない、または
+            更新内容が不正な場合
+    """
+    if not book_body.model_fields_set:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
+        )
+    try:
+        book = await book_crud.update_book(
+            db=db, book_id=book_id, book_update=book_body, version=version
+        )
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_412_PRECONDITION_FAILED,
+            detail="Book has been modified by another request",
+        ) from e
+    except IntegrityViolationError as e:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_400_BAD_REQUEST,
+            detail="Failed to update book. Please check if the author_id is valid.",
+        ) from e
+    if book is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Book not found",
+        )
+    response.headers["ETag"] = format_etag(book.version)
+    return book
+
+
+@router.delete(
+    "/books/{book_id}",
+    status_code=starlette.status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(deadline(WRITE_DEADLINE_SECONDS))],
+)
 async def delete_book(book_id: str, db: AsyncSession = Depends(get_db)):
     """
     書籍を削除する。
@@ -107,5 +396,10 @@ async def delete_book(book_id: str, db: AsyncSession = Depends(get_db)):
             status_code=starlette.status.HTTP_404_NOT_FOUND,
             detail="Book not found",
         )
-    await book_crud.delete_book(db=db, original=book)
+    if not await book_crud.delete_book(db=db, original=book):
+        # 読み取り後に別のリクエストが削除した
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Book not found",
+        )
     return None
@@ -0,0 +1,125 @@
+"""
+デバッグ API ルーター。
+
+リクエスト単位のプロファイルを参照する FastAPI ルートを定義する。
+profiling_enabled が有効な場合にのみ create_app で登録され、
+すべてのルートで X-Profile-Token ヘッダによる認証を必要とする。
+
+クラス:
+    - router: デバッグ用の FastAPI APIRouter インスタンス
+
+ルート:
+    - GET /debug/profiles: プロファイル要約の一覧取得 (新しい順)
+    - GET /debug/profiles/{profile_id}: プロファイル (pstats 形式) の取得
+
+利用方法:
+    - 取得した .prof は python -m pstats や snakeviz で参照する
+
+例:
+    curl -H "X-Profile-Token: $TOKEN" http://localhost:8000/debug/profiles
+"""
+import hmac
+from typing import List, Optional
+
+import starlette.status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from api.middlewares.profiling import ProfileStore
+from api.schemas.profile import ProfileSummary
+
+router = APIRouter()
+
+
+async def require_profile_token(
+    request: Request,
+    x_profile_token: Optional[str] = Header(None, description="プロファイル用トークン"),
+) -> None:
+    """
+    X-Profile-Token ヘッダを設定のトークンと照合する。
+
+    Args:
+        request (Request): リクエスト
+        x_profile_token (Optional[str]): X-Profile-Token ヘッダ値
+
+    Returns:
+        なし
+
+    Raises:
+        HTTPException: トークンが未設定、欠落、または一致しない場合
+    """
+    expected = request.app.state.settings.profiling_token
+    if (
+        expected is None
+        or x_profile_token is None
+        or not hmac.compare_digest(x_profile_token.encode(), expected.encode())
+    ):
+        raise HTTPException(
+            status_code=starlette.status.HTTP_403_FORBIDDEN,
+            detail="Invalid profile token",
+        )
+
+
+def get_profile_store(request: Request) -> ProfileStore:
+    """
+    アプリケーションのプロファイル保存先を返す。
+
+    Args:
+        request (Request): リクエスト
+
+    Returns:
+        ProfileStore: プロファイル保存先
+    """
+    return request.app.state.profile_store
+
+
+@router.get(
+    "/debug/profiles",
+    response_model=List[ProfileSummary],
+    dependencies=[Depends(require_profile_token)],
+)
+async def list_profiles(store: ProfileStore = Depends(get_profile_store)):
+    """
+    プロファイル要約の一覧を新しい順に取得する。
+
+    Args:
+        store (ProfileStore): プロファイル保存先
+
+    Returns:
+        List[ProfileSummary]: プロファイル要約の一覧
+
+    Raises:
+        HTTPException: X-Profile-Token が一致しない場合 (403)
+    """
+    return store.list_summaries()
+
+
+@router.get(
+    "/debug/profiles/{profile_id}",
+    response_class=FileResponse,
+    dependencies=[Depends(require_profile_token)],
+)
+async def get_profile(
+    profile_id: str, store: ProfileStore = Depends(get_profile_store)
+):
+    """
+    プロファイル (pstats 形式の .prof ファイル) を取得する。
+
+    Args:
+        profile_id (str): プロファイル ID
+        store (ProfileStore): プロファイル保存先
+
+    Returns:
+        FileResponse: プロファイルのファイル
+
+    Raises:
+        HTTPException: X-Profile-Token が一致しない場合 (403)、
+            またはプロファイルが存在しない場合 (404)
+    """
+    path = store.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=starlette.status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
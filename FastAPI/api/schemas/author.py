@@ -6,7 +6,12 @@
 クラス:
     - AuthorBase: 著者データの基底モデル
     - AuthorCreate: 著者作成用モデル
+    - AuthorUpdate: 著者部分更新用モデル
     - AuthorResponse: 著者レスポンス用モデル
+    - AuthorStats: 著者統計レスポンス用モデル
+
+定数:
+    - AUTHOR_FIELDS: fields クエリで指定可能なフィールド名
 
 利用方法:
     - 必要なモデルクラスをインポートする
@@ -18,6 +23,8 @@
     author_data = {"name": "太宰治"}
     author = AuthorCreate(**author_data)
 """
+from typing import Optional
+
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -53,12 +60,43 @@ class AuthorCreate(AuthorBase):
     }
 
 
+class AuthorUpdate(BaseModel):
+    """
+    著者部分更新用モデル。
+
+    指定されたフィールドのみを更新する。
+    """
+
+    name: Optional[str] = Field(
+        None, min_length=1, max_length=50, description="著者名 (最大50文字)"
+    )
+
+    @field_validator("name")
+    @classmethod
+    def name_must_not_be_empty(cls, v: Optional[str]) -> str:
+        """著者名が null や空白のみでないことを検証"""
+        if v is None or not v.strip():
+            raise ValueError("著者名は必須です")
+        return v
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "name": "津島修治",
+                }
+            ]
+        }
+    }
+
+
 class AuthorResponse(AuthorBase):
     """
     著者レスポンス用モデル。
     """
 
     id: str = Field(..., description="著者ID (UUID)")
+    version: int = Field(..., description="バージョン (If-Match による更新で使用)")
 
     model_config = {
         "from_attributes": True,
@@ -67,7 +105,31 @@ class AuthorResponse(AuthorBase):
                 {
                     "id": "550e8400-e29b-41d4-a716-446655440000",
                     "name": "太宰治",
+                    "version": 1,
                 }
             ]
         },
     }
+
+
+class AuthorStats(BaseModel):
+    """
+    著者統計レスポンス用モデル。
+    """
+
+    author_id: str = Field(..., description="著者ID (UUID)")
+    book_count: int = Field(..., description="著者の書籍数")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "author_id": "550e8400-e29b-41d4-a716-446655440000",
+                    "book_count": 3,
+                }
+            ]
+        },
+    }
+
+
+AUTHOR_FIELDS = ("id", "name", "version")
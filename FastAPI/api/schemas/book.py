@@ -6,8 +6,12 @@
 クラス:
     - BookBase: 書籍データの基底モデル
     - BookCreate: 書籍作成用モデル
+    - BookUpdate: 書籍部分更新用モデル
     - BookResponse: 書籍レスポンス用モデル
 
+定数:
+    - BOOK_FIELDS: fields クエリで指定可能なフィールド名
+
 利用方法:
     - 必要なモデルクラスをインポートする
     - 書籍データの検証や取り扱いに利用する
@@ -18,6 +22,8 @@
     book_data = {"title": "人間失格", "author_id": "550e8400-e29b-41d4-a716-446655440000"}
     book = BookCreate(**book_data)
 """
+from typing import Optional
+
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -55,12 +61,52 @@ class BookCreate(BookBase):
     }
 
 
+class BookUpdate(BaseModel):
+    """
+    書籍部分更新用モデル。
+
+    指定されたフィールドのみを更新する。
+    """
+
+    title: Optional[str] = Field(
+        None, min_length=1, max_length=100, description="書籍タイトル (最大100文字)"
+    )
+    author_id: Optional[str] = Field(None, description="著者ID (UUID)")
+
+    @field_validator("title")
+    @classmethod
+    def title_must_not_be_empty(cls, v: Optional[str]) -> str:
+        """タイトルが null や空白のみでないことを検証"""
+        if v is None or not v.strip():
+            raise ValueError("タイトルは必須です")
+        return v
+
+    @field_validator("author_id")
+    @classmethod
+    def author_id_must_not_be_null(cls, v: Optional[str]) -> str:
+        """著者IDが null でないことを検証"""
+        if v is None:
+            raise ValueError("著者IDは必須です")
+        return v
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "title": "斜陽",
+                }
+            ]
+        }
+    }
+
+
 class BookResponse(BookBase):
     """
     書籍レスポンス用モデル。
     """
 
     id: str = Field(..., description="書籍ID (UUID)")
+    version: int = Field(..., description="バージョン (If-Match による更新で使用)")
 
     model_config = {
         "from_attributes": True,
@@ -70,7 +116,11 @@ class BookResponse(BookBase):
                     "id": "660e8400-e29b-41d4-a716-446655440001",
                     "title": "人間失格",
                     "author_id": "550e8400-e29b-41d4-a716-446655440000",
+                    "version": 1,
                 }
             ]
         },
     }
+
+
+BOOK_FIELDS = ("id", "title", "author_id", "version")
@@ -0,0 +1,56 @@
+"""
+スパースフィールドセットモジュール。
+
+`?fields=id,title` 形式のクエリパラメータを解釈し、
+レスポンスに含めるフィールド名のタプルへ変換する。
+
+関数:
+    - parse_fields: fields クエリパラメータを検証・正規化する
+
+利用方法:
+    - 各スキーマで公開フィールドの一覧を定義する
+    - ルーターの依存関数から parse_fields を呼び出す
+
+例:
+    from api.schemas.fields import parse_fields
+
+    fields = parse_fields("id,title", allowed=("id", "title", "author_id"))
+    # fields == ("id", "title")
+"""
+from typing import Optional, Sequence, Tuple
+
+from api.exceptions import UnknownFieldError
+
+
+def parse_fields(
+    raw: Optional[str], allowed: Sequence[str]
+) -> Optional[Tuple[str, ...]]:
+    """
+    fields クエリパラメータを解釈する。
+
+    重複を除き、allowed の定義順に並べたタプルを返す。
+    定義順に揃えることで、同じ組み合わせのクエリが同じ SELECT 文になる。
+
+    Args:
+        raw (Optional[str]): カンマ区切りのフィールド名 (未指定なら None)
+        allowed (Sequence[str]): 指定可能なフィールド名
+
+    Returns:
+        Optional[Tuple[str, ...]]: 要求されたフィールド名 (未指定なら None)
+
+    Raises:
+        UnknownFieldError: 未知のフィールド名、または空の指定が含まれる場合
+    """
+    if raw is None:
+        return None
+
+    requested = {name.strip() for name in raw.split(",")}
+    requested.discard("")
+    if not requested:
+        raise UnknownFieldError("fields must not be empty")
+
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise UnknownFieldError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return tuple(name for name in allowed if name in requested)
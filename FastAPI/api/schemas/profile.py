@@ -0,0 +1,54 @@
+"""
+プロファイルスキーマモジュール。
+
+リクエスト単位のプロファイル要約を表す Pydantic モデルを定義する。
+
+クラス:
+    - ProfileSummary: プロファイル要約レスポンス用モデル
+
+例:
+    from api.schemas.profile import ProfileSummary
+
+    summary = ProfileSummary(**store.list_summaries()[0])
+"""
+from pydantic import BaseModel, Field
+
+
+class ProfileSummary(BaseModel):
+    """
+    プロファイル要約レスポンス用モデル。
+
+    wall_ms は loop_ms (イベントループ上の時間) と db_ms (DB 待ち時間) の合計になる。
+    """
+
+    id: str = Field(..., description="プロファイルID (GET /debug/profiles/{id} で取得)")
+    method: str = Field(..., description="HTTP メソッド")
+    path: str = Field(..., description="リクエストパス")
+    status_code: int = Field(..., description="レスポンスのステータスコード")
+    trigger: str = Field(..., description="取得のきっかけ (header または sample)")
+    started_at: str = Field(..., description="リクエスト開始時刻 (ISO 8601, UTC)")
+    wall_ms: float = Field(..., description="リクエスト全体の経過時間 (ミリ秒)")
+    db_ms: float = Field(..., description="DB の応答を待っていた時間 (ミリ秒)")
+    loop_ms: float = Field(..., description="イベントループ上の時間 (ミリ秒)")
+    cpu_ms: float = Field(..., description="プロセスの CPU 時間 (ミリ秒)")
+    db_statements: int = Field(..., description="実行した SQL 文の数")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "id": "01760000000000000000-3f2a9c1b",
+                    "method": "GET",
+                    "path": "/books",
+                    "status_code": 200,
+                    "trigger": "header",
+                    "started_at": "2025-10-19T03:00:00.000000+00:00",
+                    "wall_ms": 48.2,
+                    "db_ms": 41.5,
+                    "loop_ms": 6.7,
+                    "cpu_ms": 7.1,
+                    "db_statements": 2,
+                }
+            ]
+        },
+    }
@@ -0,0 +1,125 @@
+"""
+アプリケーション設定モジュール。
+
+環境変数 (接頭辞 BOOKS_API_) からアプリケーションの設定を読み込む。
+
+クラス:
+    - Settings: アプリケーション設定
+
+利用方法:
+    - Settings.from_env() で環境変数から設定を生成する
+    - テストでは Settings(...) で直接生成する
+
+例:
+    # BOOKS_API_DB_URL で接続先を指定する
+    # BOOKS_API_SNAPSHOT_ENABLED=true を指定すると読み取りをスナップショットから返す
+    # BOOKS_API_PROFILING_ENABLED=true を指定するとリクエスト単位のプロファイルを取得する
+    settings = Settings.from_env()
+    if settings.snapshot_enabled:
+        ...
+"""
+import os
+from typing import Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+ENV_PREFIX = "BOOKS_API_"
+DEFAULT_DB_URL = "mysql+aiomysql://root@db:3306/prod?charset=utf8"
+
+
+class Settings(BaseModel):
+    """
+    アプリケーション設定。
+    """
+
+    db_url: str = Field(DEFAULT_DB_URL, description="非同期 DB 接続 URL")
+    db_echo: bool = Field(True, description="実行した SQL をログ出力するか")
+    db_pool_size: int = Field(5, ge=1, description="接続プールに保持する接続数")
+    db_max_overflow: int = Field(10, ge=0, description="接続プールを超えて一時的に開ける接続数")
+    db_lock_wait_timeout: int = Field(
+        5, ge=1, description="MySQL の行ロック待ちの上限 (秒, innodb_lock_wait_timeout)"
+    )
+    request_deadline: float = Field(
+        10.0, gt=0, description="ルートで指定がない場合のリクエストの処理期限 (秒)"
+    )
+    circuit_failure_threshold: int = Field(5, ge=1, description="サーキットブレーカーを開く連続失敗数")
+    circuit_slow_call_seconds: float = Field(
+        2.0, gt=0, description="失敗として数える SQL の応答時間 (秒)"
+    )
+    circuit_open_seconds: float = Field(
+        30.0, gt=0, description="サーキットブレーカーを開いてからプローブを通すまでの時間 (秒)"
+    )
+    circuit_half_open_probes: int = Field(1, ge=1, description="半開状態で同時に通すプローブ数")
+    warmup_connections: int = Field(
+        2, ge=0, description="起動時に事前に開いておく接続数 (db_pool_size が上限)"
+    )
+    warmup_statements: bool = Field(
+        True, description="起動時に参照系 CRUD の SQL をコンパイル済みキャッシュへ載せるか"
+    )
+    warmup_writes: bool = Field(
+        False,
+        description="起動時に更新系 CRUD の SQL も温めるか (ロールバックするが行ロックと採番を消費する)",
+    )
+    counter_reconcile_enabled: bool = Field(
+        True,
+        description="件数カウンタの再計算ジョブを実行するか (複数インスタンスでは 1 台だけ有効にする)",
+    )
+    counter_reconcile_interval: float = Field(
+        300.0, gt=0, description="件数カウンタの再計算間隔 (秒)"
+    )
+    snapshot_enabled: bool = Field(False, description="読み取りをインメモリスナップショットから返すか")
+    snapshot_refresh_interval: float = Field(
+        5.0, gt=0, description="スナップショットの差分更新間隔 (秒)"
+    )
+    change_retention: int = Field(100000, gt=0, description="保持する変更履歴の件数")
+    compression_enabled: bool = Field(
+        True, description="Accept-Encoding に応じてレスポンスを圧縮するか"
+    )
+    compression_minimum_size: int = Field(1024, ge=0, description="圧縮する本文の最小サイズ (バイト)")
+    compression_thread_min_size: int = Field(
+        256 * 1024,
+        ge=0,
+        description="別スレッドで圧縮する本文の最小サイズ (バイト, イベントループを止めない)",
+    )
+    compression_cache_bytes: int = Field(
+        32 * 1024 * 1024,
+        ge=0,
+        description="スナップショットモードで圧縮済み一覧をキャッシュする上限 (バイト, 0 で無効)",
+    )
+    profiling_enabled: bool = Field(False, description="リクエスト単位のプロファイリングを有効にするか")
+    profiling_token: Optional[str] = Field(
+        None,
+        min_length=16,
+        description="X-Profile-Token ヘッダで照合するトークン (未設定ならヘッダでは起動しない)",
+    )
+    profiling_sample_rate: float = Field(
+        0.0, ge=0, le=1, description="プロファイルを取得するリクエストの割合"
+    )
+    profiling_dir: str = Field(
+        "/tmp/books-api-profiles", description="プロファイルの出力先ディレクトリ"
+    )
+    profiling_max_files: int = Field(
+        50, ge=1, description="保持するプロファイルの件数 (超えた分は古い順に削除)"
+    )
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """
+        環境変数から設定を生成する。
+
+        各フィールドは ENV_PREFIX + フィールド名の大文字 (例: BOOKS_API_SNAPSHOT_ENABLED)
+        から読み込み、未設定のフィールドは既定値を使う。
+
+        Args:
+            environ (Optional[Mapping[str, str]]): 環境変数 (None なら os.environ)
+
+        Returns:
+            Settings: アプリケーション設定
+        """
+        environ = os.environ if environ is None else environ
+        values = {
+            name: environ[ENV_PREFIX + name.upper()]
+            for name in cls.model_fields
+            if ENV_PREFIX + name.upper() in environ
+        }
+        return cls.model_validate(values)
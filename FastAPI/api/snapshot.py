@@ -0,0 +1,322 @@
+"""
+インメモリカタログスナップショットモジュール。
+
+読み取りの多いレプリカ向けに、書籍と著者の全件をプロセス内に保持し、
+一覧取得・ID 検索を DB に問い合わせずに返すためのスナップショットを提供する。
+
+- レコードは __slots__ を使った軽量オブジェクトで、タイトル / 著者名順に整列して保持する
+- 各レコードは JSON 断片を事前にシリアライズしており、ページは断片の連結だけで生成する
+- changes テーブルの変更シーケンスを追跡し、変更された行だけを差分更新する
+
+クラス:
+    - BookRecord: 書籍レコード
+    - AuthorRecord: 著者レコード
+    - SortedTable: ソート済みレコードの表
+    - CatalogueSnapshot: 書籍・著者のスナップショット
+
+関数:
+    - get_snapshot: アプリケーションに登録されたスナップショットを返す依存関数
+
+利用方法:
+    - 起動時に CatalogueSnapshot.load でスナップショットを構築する
+    - 定期的に CatalogueSnapshot.refresh で差分更新する
+
+例:
+    snapshot = CatalogueSnapshot()
+    async with async_session() as session:
+        await snapshot.load(session)
+
+    body = snapshot.books.page_json(offset=0, limit=100)
+"""
+import bisect
+import json
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import api.cruds.author as author_crud
+import api.cruds.book as book_crud
+import api.cruds.change as change_crud
+import api.schemas.author as author_schema
+import api.schemas.book as book_schema
+
+# コミット順と採番順が前後しうるため、直近この範囲のシーケンスは毎回読み直す
+REREAD_WINDOW = 1000
+MAX_CHANGES_PER_REFRESH = 10000
+
+
+def _dumps(content: Any) -> bytes:
+    # fastapi.responses.JSONResponse と同じ形式でシリアライズする
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class BookRecord:
+    """
+    書籍レコード。
+
+    属性:
+        id (str): 書籍 ID (UUID)
+        title (str): 書籍タイトル
+        author_id (str): 著者 ID (UUID)
+        version (int): バージョン
+        json (bytes): BookResponse 形式の JSON
+    """
+
+    __slots__ = ("id", "title", "author_id", "version", "json")
+
+    FIELDS = book_schema.BOOK_FIELDS
+    JSON_FIELDS = tuple(book_schema.BookResponse.model_fields)
+    # DB の一覧 (cruds の _LIST_ORDER) と同じく、コードポイント順・同値は ID 順
+    SORT_KEY = attrgetter("title", "id")
+
+    def __init__(self, id: str, title: str, author_id: str, version: int) -> None:
+        # pylint: disable=redefined-builtin
+        self.id = id
+        self.title = title
+        self.author_id = author_id
+        self.version = version
+        self.json = _dumps(self.to_dict(self.JSON_FIELDS))
+
+    def to_dict(self, fields: Sequence[str]) -> Dict[str, Any]:
+        """指定フィールドのみの辞書に変換する"""
+        return {name: getattr(self, name) for name in fields}
+
+
+class AuthorRecord:
+    """
+    著者レコード。
+
+    属性:
+        id (str): 著者 ID (UUID)
+        name (str): 著者名
+        version (int): バージョン
+        json (bytes): AuthorResponse 形式の JSON
+    """
+
+    __slots__ = ("id", "name", "version", "json")
+
+    FIELDS = author_schema.AUTHOR_FIELDS
+    JSON_FIELDS = tuple(author_schema.AuthorResponse.model_fields)
+    # DB の一覧 (cruds の _LIST_ORDER) と同じく、コードポイント順・同値は ID 順
+    SORT_KEY = attrgetter("name", "id")
+
+    def __init__(self, id: str, name: str, version: int) -> None:
+        # pylint: disable=redefined-builtin
+        self.id = id
+        self.name = name
+        self.version = version
+        self.json = _dumps(self.to_dict(self.JSON_FIELDS))
+
+    def to_dict(self, fields: Sequence[str]) -> Dict[str, Any]:
+        """指定フィールドのみの辞書に変換する"""
+        return {name: getattr(self, name) for name in fields}
+
+
+class SortedTable:
+    """
+    ソート済みレコードの表。
+
+    ID による検索用の辞書と、ソートキー順に並べたリストの両方で保持する。
+    同じタイトル / 著者名の並びは ID 順で固定する。
+    """
+
+    def __init__(self, record_type: type) -> None:
+        self.record_type = record_type
+        self._by_id: Dict[str, Any] = {}
+        self._rows: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def replace_all(self, records: Iterable[Any]) -> None:
+        """全レコードを置き換える"""
+        rows = sorted(records, key=self.record_type.SORT_KEY)
+        self._by_id = {record.id: record for record in rows}
+        self._rows = rows
+
+    def upsert(self, record: Any) -> None:
+        """レコードを追加、または同じ ID のレコードを置き換える"""
+        self.remove(record.id)
+        key = self.record_type.SORT_KEY
+        self._rows.insert(bisect.bisect_left(self._rows, key(record), key=key), record)
+        self._by_id[record.id] = record
+
+    def remove(self, row_id: str) -> None:
+        """レコードを削除する (存在しなければ何もしない)"""
+        record = self._by_id.pop(row_id, None)
+        if record is None:
+            return
+        key = self.record_type.SORT_KEY
+        del self._rows[bisect.bisect_left(self._rows, key(record), key=key)]
+
+    def get(self, row_id: str) -> Optional[Any]:
+        """ID でレコードを取得する"""
+        return self._by_id.get(row_id)
+
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Any]:
+        """ソートキー順のレコードを切り出す"""
+        stop = None if limit is None else offset + limit
+        return self._rows[offset:stop]
+
+    def page_json(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> bytes:
+        """ソートキー順のレコードを切り出して JSON 配列にする"""
+        return self.records_json(self.page(offset, limit), fields)
+
+    @staticmethod
+    def record_json(record: Any, fields: Optional[Sequence[str]] = None) -> bytes:
+        """レコードを JSON にする (fields 未指定なら事前シリアライズ済みの JSON を返す)"""
+        if fields is not None:
+            return _dumps(record.to_dict(fields))
+        return record.json
+
+    @staticmethod
+    def records_json(
+        records: Sequence[Any], fields: Optional[Sequence[str]] = None
+    ) -> bytes:
+        """レコードを JSON 配列にする (fields 未指定なら事前シリアライズ済みの断片を連結する)"""
+        if fields is not None:
+            return _dumps([record.to_dict(fields) for record in records])
+        return b"[" + b",".join(record.json for record in records) + b"]"
+
+
+class CatalogueSnapshot:
+    """
+    書籍・著者のインメモリスナップショット。
+
+    属性:
+        books (SortedTable): タイトル順の書籍
+        authors (SortedTable): 著者名順の著者
+        seq (int): 反映済みの変更シーケンス
+        generation (int): 内容が変わるたびに増える世代番号 (キャッシュの無効化に使う)
+    """
+
+    def __init__(self, max_changes_per_refresh: int = MAX_CHANGES_PER_REFRESH) -> None:
+        self.books = SortedTable(BookRecord)
+        self.authors = SortedTable(AuthorRecord)
+        self.seq = 0
+        self.generation = 0
+        self.max_changes_per_refresh = max_changes_per_refresh
+        self._applied: Set[int] = set()
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        スナップショットを DB の全件から構築し直す。
+
+        Args:
+            db (AsyncSession): 非同期 SQLAlchemy セッション
+
+        Returns:
+            なし
+        """
+        # 読み込み中の変更を取りこぼさないよう、シーケンスは行より先に読む
+        _, last = await change_crud.get_change_seq_range(db)
+        authors = await author_crud.get_authors_projection(
+            db, fields=AuthorRecord.FIELDS
+        )
+        books = await book_crud.get_books_projection(db, fields=BookRecord.FIELDS)
+
+        self.authors.replace_all(AuthorRecord(**row) for row in authors)
+        self.books.replace_all(BookRecord(**row) for row in books)
+        self.seq = last
+        self.generation += 1
+        self._applied = set()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """
+        前回以降の変更をスナップショットに反映する。
+
+        変更された行だけを DB から取り直す。変更履歴が削除済みで追跡できない場合や、
+        変更が多すぎる場合は全件を読み直す。
+
+        Args:
+            db (AsyncSession): 非同期 SQLAlchemy セッション
+
+        Returns:
+            なし
+        """
+        first, last = await change_crud.get_change_seq_range(db)
+        if last < self.seq or first > self.seq + 1:
+            await self.load(db)
+            return
+
+        since = max(self.seq - REREAD_WINDOW, 0)
+        limit = self.max_changes_per_refresh + REREAD_WINDOW
+        changes = [
+            change
+            for change in await change_crud.get_changes_since(
+                db, seq=since, limit=limit
+            )
+            if change[0] not in self._applied
+        ]
+        if not changes:
+            return
+        if len(changes) >= self.max_changes_per_refresh:
+            await self.load(db)
+            return
+
+        book_ids = list({row_id for _, table, row_id in changes if table == "books"})
+        author_ids = list(
+            {row_id for _, table, row_id in changes if table == "authors"}
+        )
+        book_rows = (
+            await book_crud.get_books_by_ids(
+                db, book_ids=book_ids, fields=BookRecord.FIELDS
+            )
+            if book_ids
+            else []
+        )
+        author_rows = (
+            await author_crud.get_authors_by_ids(
+                db, author_ids=author_ids, fields=AuthorRecord.FIELDS
+            )
+            if author_ids
+            else []
+        )
+
+        # ここから先は await しないため、読み取り側が更新途中の状態を見ることはない
+        self._apply(self.books, BookRecord, book_ids, book_rows)
+        self._apply(self.authors, AuthorRecord, author_ids, author_rows)
+        self.seq = max(self.seq, changes[-1][0])
+        self.generation += 1
+        self._applied = {
+            seq
+            for seq in self._applied.union(change[0] for change in changes)
+            if seq > self.seq - REREAD_WINDOW
+        }
+
+    @staticmethod
+    def _apply(
+        table: SortedTable,
+        record_type: type,
+        row_ids: Sequence[str],
+        rows: Sequence[Dict[str, Any]],
+    ) -> None:
+        found = {row["id"]: row for row in rows}
+        for row_id in row_ids:
+            row = found.get(row_id)
+            if row is None:
+                table.remove(row_id)
+            else:
+                table.upsert(record_type(**row))
+
+
+def get_snapshot(request: Request) -> Optional[CatalogueSnapshot]:
+    """
+    アプリケーションに登録されたスナップショットを返す。
+
+    Args:
+        request (Request): リクエスト
+
+    Returns:
+        Optional[CatalogueSnapshot]: スナップショット (スナップショットモードでなければ None)
+    """
+    return getattr(request.app.state, "snapshot", None)
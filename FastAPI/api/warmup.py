@@ -0,0 +1,152 @@
+"""
+起動時ウォームアップモジュール。
+
+スケールアウト直後の最初のリクエストが接続確立や SQL のコンパイルを
+肩代わりしないよう、起動時に接続プールとコンパイル済みキャッシュを温める。
+
+関数:
+    - open_pool_connections: 接続プールに指定数の接続を事前に開く
+    - warm_statement_cache: CRUD の SQL をコンパイル済みキャッシュへ載せる
+
+既定では参照系の SQL のみを実行し、DB には書き込まない (読み取り専用のレプリカでも使える)。
+更新系の SQL は include_writes を指定した場合のみ温める。
+
+利用方法:
+    - アプリケーションの lifespan で init_engine の直後に呼び出す
+
+例:
+    engine = init_engine(settings)
+    await open_pool_connections(engine, count=settings.warmup_connections)
+    await warm_statement_cache(engine, include_writes=settings.warmup_writes)
+"""
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+import api.cruds.author as author_crud
+import api.cruds.book as book_crud
+import api.cruds.change as change_crud
+import api.cruds.counter as counter_crud
+import api.schemas.author as author_schema
+import api.schemas.book as book_schema
+
+# 参照系の SQL を温めるためのダミー ID (該当する行は存在しない)
+WARMUP_ID = "00000000-0000-0000-0000-000000000000"
+
+logger = logging.getLogger(__name__)
+
+
+async def open_pool_connections(engine: AsyncEngine, count: int) -> None:
+    """
+    接続プールに指定数の接続を事前に開く。
+
+    同時に接続してから返却するため、接続はすべてプールに残る。
+
+    Args:
+        engine (AsyncEngine): 非同期エンジン
+        count (int): 開く接続数
+
+    Returns:
+        なし
+    """
+    connections = await asyncio.gather(*(engine.connect() for _ in range(count)))
+    for connection in connections:
+        await connection.close()
+
+
+async def warm_statement_cache(
+    engine: AsyncEngine, include_writes: bool = False
+) -> None:
+    """
+    CRUD の SQL をエンジンのコンパイル済みキャッシュへ載せる。
+
+    参照系の CRUD 関数を外側のトランザクション内で実際に 1 回ずつ実行し、最後にロールバックする。
+    参照系は limit=1 または該当行のない ID で実行し、テーブルの件数によらず一定時間で終わる。
+    include_writes を指定すると、更新系の CRUD 関数も実行する。
+    CRUD 関数内のコミットは SAVEPOINT の解放になるためデータは残らないが、
+    ロールバックまでの間は件数カウンタの行ロックを保持し、変更履歴の採番も消費する。
+    失敗しても起動は止めず、警告ログを残して通常の (コールドな) 経路に任せる。
+
+    Args:
+        engine (AsyncEngine): 非同期エンジン
+        include_writes (bool): 更新系の SQL も温めるか
+
+    Returns:
+        なし
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(
+            bind=connection,
+            autoflush=False,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            await _run_reads(session)
+            if include_writes:
+                await _run_writes(session)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("statement cache warm-up failed", exc_info=True)
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+async def _run_reads(db: AsyncSession) -> None:
+    # 起動時間が件数に比例しないよう、limit=1 か存在しない ID で絞った SQL だけを実行する。
+    # limit なしの一覧は別のキャッシュキーになるため、最初のリクエストでコンパイルされる
+    await author_crud.get_authors(db, offset=0, limit=1)
+    await author_crud.get_authors_projection(
+        db, fields=author_schema.AUTHOR_FIELDS, offset=0, limit=1
+    )
+    await author_crud.get_authors_by_ids(
+        db, author_ids=[WARMUP_ID], fields=author_schema.AUTHOR_FIELDS
+    )
+    await author_crud.get_author_book_count(db, author_id=WARMUP_ID)
+    await author_crud.get_author_by_id(db, author_id=WARMUP_ID)
+
+    await book_crud.get_books(db, offset=0, limit=1)
+    await book_crud.get_books_projection(
+        db, fields=book_schema.BOOK_FIELDS, offset=0, limit=1
+    )
+    await book_crud.get_books_by_ids(
+        db, book_ids=[WARMUP_ID], fields=book_schema.BOOK_FIELDS
+    )
+    await book_crud.get_book_by_id(db, book_id=WARMUP_ID)
+
+    for name in ("authors", "books"):
+        await counter_crud.get_counter(db, name=name)
+    await change_crud.get_change_seq_range(db)
+    await change_crud.get_changes_since(db, seq=0, limit=1)
+
+
+async def _run_writes(db: AsyncSession) -> None:
+    author = await author_crud.create_author(
+        db, author_create=author_schema.AuthorCreate(name="warmup")
+    )
+    book = await book_crud.create_book(
+        db, book_create=book_schema.BookCreate(title="warmup", author_id=author.id)
+    )
+    await author_crud.update_author(
+        db,
+        author_id=author.id,
+        author_update=author_schema.AuthorUpdate(name="warmup"),
+        version=author.version,
+    )
+    await book_crud.update_book(
+        db,
+        book_id=book.id,
+        book_update=book_schema.BookUpdate(title="warmup", author_id=author.id),
+        version=book.version,
+    )
+    await book_crud.update_book(
+        db,
+        book_id=book.id,
+        book_update=book_schema.BookUpdate(title="warmup"),
+        version=book.version + 1,
+    )
+    await book_crud.delete_book(
+        db, original=await book_crud.get_book_by_id(db, book_id=book.id)
+    )
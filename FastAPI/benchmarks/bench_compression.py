@@ -0,0 +1,86 @@
+"""
+レスポンス圧縮のベンチマーク。
+
+スナップショットから返す GET /books の全件 JSON を対象に、エンコーディングごとに
+- 圧縮にかかる CPU 時間 (1 MB あたり)
+- 削減できたバイト数と圧縮率
+を一括圧縮とストリーミング (チャンクごとの逐次圧縮) で計測する。
+zstd / br は zstandard / brotli が導入されている場合のみ計測する。
+
+実行方法:
+    poetry run python -m benchmarks.bench_compression --books 100000
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from api.middlewares.compression import available_encodings, new_compressor
+from api.snapshot import BookRecord, CatalogueSnapshot
+
+AUTHORS = 1000
+
+
+def _payload(books: int) -> bytes:
+    author_ids = [str(uuid.uuid4()) for _ in range(AUTHORS)]
+    snapshot = CatalogueSnapshot()
+    snapshot.books.replace_all(
+        BookRecord(
+            id=str(uuid.uuid4()),
+            title=f"title-{i:08d}",
+            author_id=author_ids[i % AUTHORS],
+            version=1,
+        )
+        for i in range(books)
+    )
+    return snapshot.books.page_json()
+
+
+def _compress(encoding: str, payload: bytes, chunk_size: int) -> bytes:
+    # CompressionMiddleware と同じく、最後以外のチャンクはフラッシュしてから送る
+    compressor = new_compressor(encoding)
+    parts = []
+    for i in range(0, len(payload), chunk_size):
+        parts.append(compressor.compress(payload[i : i + chunk_size]))
+        if i + chunk_size < len(payload):
+            parts.append(compressor.sync_flush())
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def measure(encoding: str, payload: bytes, chunk_size: int, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        compressed = _compress(encoding, payload, chunk_size)
+        samples.append(time.process_time() - start)
+    return statistics.median(samples), len(compressed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = _payload(args.books)
+    megabytes = len(payload) / 2**20
+    print(f"payload: GET /books with {args.books} books, {megabytes:.1f} MiB")
+    print(
+        f"  {'encoding':<8} {'mode':<9} {'CPU ms/MiB':>10} {'ratio':>6} "
+        f"{'saved MiB':>9} {'saved/CPU-s':>12}"
+    )
+    modes = (("oneshot", len(payload)), ("stream", args.chunk_size))
+    for encoding in available_encodings():
+        for mode, chunk_size in modes:
+            seconds, size = measure(encoding, payload, chunk_size, args.repeat)
+            saved = (len(payload) - size) / 2**20
+            print(
+                f"  {encoding:<8} {mode:<9} {seconds * 1000 / megabytes:10.2f} "
+                f"{len(payload) / size:6.1f} {saved:9.1f} {saved / seconds:9.0f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+インメモリスナップショットのベンチマーク。
+
+- 書籍 100 万件あたりのメモリ使用量 (tracemalloc で計測した値から換算)
+- 1 ページ (既定 100 件) を返すまでのレイテンシ: スナップショット vs DB (SQLite in-memory)
+
+実行方法:
+    poetry run python -m benchmarks.bench_snapshot --books 200000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import api.cruds.book as book_crud
+from api.db import Base
+from api.models import model
+from api.snapshot import BookRecord, CatalogueSnapshot
+
+AUTHORS = 1000
+
+
+def _rows(books: int):
+    author_ids = [str(uuid.uuid4()) for _ in range(AUTHORS)]
+    authors = [
+        {"id": author_id, "name": f"author-{i:05d}", "version": 1}
+        for i, author_id in enumerate(author_ids)
+    ]
+    books_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"title-{i:08d}",
+            "author_id": author_ids[i % AUTHORS],
+            "version": 1,
+        }
+        for i in range(books)
+    ]
+    return authors, books_rows
+
+
+def measure_memory(books: int) -> float:
+    # 行の文字列もスナップショットが保持するため、行の生成から計測する
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    _, books_rows = _rows(books)
+    snapshot = CatalogueSnapshot()
+    snapshot.books.replace_all(BookRecord(**row) for row in books_rows)
+    del books_rows
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(snapshot.books)
+
+
+def _timeit(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def _atimeit(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def measure_latency(authors, books_rows, page_size: int, repeat: int):
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(model.Author), authors)
+        await conn.execute(insert(model.Book), books_rows)
+
+    snapshot = CatalogueSnapshot()
+    async with session_factory() as session:
+        await snapshot.load(session)
+
+    offset = len(books_rows) // 2
+    results = {}
+    async with session_factory() as session:
+
+        async def db_page():
+            rows = await book_crud.get_books_projection(
+                session, fields=BookRecord.FIELDS, offset=offset, limit=page_size
+            )
+            json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode()
+
+        results["db"] = await _atimeit(db_page, repeat)
+
+    results["snapshot"] = _timeit(
+        lambda: snapshot.books.page_json(offset, page_size), repeat
+    )
+    results["snapshot_fields"] = _timeit(
+        lambda: snapshot.books.page_json(offset, page_size, ("id", "title")), repeat
+    )
+    results["snapshot_lookup"] = _timeit(
+        lambda: snapshot.books.get(books_rows[offset]["id"]), repeat
+    )
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    per_book = measure_memory(args.books)
+    print(
+        f"memory: {per_book:.0f} B/book, {per_book * 1e6 / 2**20:.0f} MiB per 1M books"
+    )
+
+    authors, books_rows = _rows(args.books)
+    results = asyncio.run(
+        measure_latency(authors, books_rows, args.page_size, args.repeat)
+    )
+    print(f"page of {args.page_size} at offset {args.books // 2} (median):")
+    for name, seconds in results.items():
+        print(f"  {name:<16} {seconds * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
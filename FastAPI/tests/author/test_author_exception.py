@@ -12,3 +12,37 @@ async def test_create_author_blank_name(async_client):
 async def test_create_author_too_long(async_client):
     response = await async_client.post("/authors", json={"name": "a" * 51})
     assert response.status_code == starlette.status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_list_authors_unknown_field(async_client):
+    response = await async_client.get("/authors", params={"fields": "age"})
+    assert response.status_code == starlette.status.HTTP_400_BAD_REQUEST
+
+
+async def test_get_author_stats_not_found(async_client):
+    response = await async_client.get(
+        "/authors/11111111-1111-1111-1111-111111111111/stats"
+    )
+    assert response.status_code == starlette.status.HTTP_404_NOT_FOUND
+
+
+async def test_update_author_version_conflict(async_client):
+    response = await async_client.post("/authors", json={"name": "Osamu Dazai"})
+
+    response = await async_client.patch(
+        f"/authors/{response.json()['id']}",
+        json={"name": "Shuji Tsushima"},
+        headers={"If-Match": '"2"'},
+    )
+    assert response.status_code == starlette.status.HTTP_412_PRECONDITION_FAILED
+
+
+async def test_update_author_blank_name(async_client):
+    response = await async_client.post("/authors", json={"name": "Osamu Dazai"})
+
+    response = await async_client.patch(
+        f"/authors/{response.json()['id']}",
+        json={"name": None},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == starlette.status.HTTP_422_UNPROCESSABLE_ENTITY
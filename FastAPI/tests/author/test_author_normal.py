@@ -32,3 +32,44 @@ async def test_list_authors_ordered(async_client):
     assert response.status_code == starlette.status.HTTP_200_OK
     response_obj = response.json()
     assert [item["name"] for item in response_obj] == ["A Author", "B Author"]
+
+
+async def test_list_authors_sparse_fields(async_client):
+    await async_client.post("/authors", json={"name": "Osamu Dazai"})
+
+    response = await async_client.get("/authors", params={"fields": "name"})
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == [{"name": "Osamu Dazai"}]
+
+
+async def test_list_authors_total_count(async_client):
+    await async_client.post("/authors", json={"name": "A Author"})
+    await async_client.post("/authors", json={"name": "B Author"})
+
+    response = await async_client.get("/authors")
+    assert response.headers["X-Total-Count"] == "2"
+
+
+async def test_get_author_stats(async_client):
+    response = await async_client.post("/authors", json={"name": "Osamu Dazai"})
+    author_id = response.json()["id"]
+    for title in ["A Title", "B Title"]:
+        await async_client.post("/books", json={"title": title, "author_id": author_id})
+
+    response = await async_client.get(f"/authors/{author_id}/stats")
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == {"author_id": author_id, "book_count": 2}
+
+
+async def test_update_author(async_client):
+    response = await async_client.post("/authors", json={"name": "Osamu Dazai"})
+    author_id = response.json()["id"]
+
+    response = await async_client.patch(
+        f"/authors/{author_id}",
+        json={"name": "Shuji Tsushima"},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == {"id": author_id, "name": "Shuji Tsushima", "version": 2}
+    assert response.headers["ETag"] == '"2"'
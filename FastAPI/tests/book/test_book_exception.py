@@ -1,6 +1,8 @@
 import pytest
 import starlette.status
 
+import api.cruds.book as book_crud
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -31,3 +33,134 @@ async def test_delete_book_not_found(async_client):
         "/books/11111111-1111-1111-1111-111111111111"
     )
     assert response.status_code == starlette.status.HTTP_404_NOT_FOUND
+
+
+async def test_list_books_unknown_field(async_client):
+    response = await async_client.get("/books", params={"fields": "id,price"})
+    assert response.status_code == starlette.status.HTTP_400_BAD_REQUEST
+
+
+async def test_list_books_empty_fields(async_client):
+    response = await async_client.get("/books", params={"fields": ","})
+    assert response.status_code == starlette.status.HTTP_400_BAD_REQUEST
+
+
+async def test_get_book_not_found(async_client):
+    response = await async_client.get("/books/11111111-1111-1111-1111-111111111111")
+    assert response.status_code == starlette.status.HTTP_404_NOT_FOUND
+
+
+async def test_list_books_empty_ids(async_client):
+    response = await async_client.get("/books", params={"ids": " , "})
+    assert response.status_code == starlette.status.HTTP_400_BAD_REQUEST
+
+
+async def test_create_book_invalid_author_id_keeps_total_count(async_client):
+    await async_client.post(
+        "/books",
+        json={
+            "title": "Ghost Book",
+            "author_id": "11111111-1111-1111-1111-111111111111",
+        },
+    )
+
+    response = await async_client.get("/books")
+    assert response.headers["X-Total-Count"] == "0"
+
+
+async def test_update_book_version_conflict(async_client):
+    author_id = await _create_author(async_client)
+    response = await async_client.post(
+        "/books", json={"title": "Old Title", "author_id": author_id}
+    )
+    book_id = response.json()["id"]
+    await async_client.patch(
+        f"/books/{book_id}", json={"title": "First"}, headers={"If-Match": '"1"'}
+    )
+
+    response = await async_client.patch(
+        f"/books/{book_id}", json={"title": "Second"}, headers={"If-Match": '"1"'}
+    )
+    assert response.status_code == starlette.status.HTTP_412_PRECONDITION_FAILED
+
+
+async def test_update_book_without_if_match(async_client):
+    author_id = await _create_author(async_client)
+    response = await async_client.post(
+        "/books", json={"title": "Old Title", "author_id": author_id}
+    )
+
+    response = await async_client.patch(
+        f"/books/{response.json()['id']}", json={"title": "New Title"}
+    )
+    assert response.status_code == starlette.status.HTTP_428_PRECONDITION_REQUIRED
+
+
+async def test_update_book_invalid_author_id(async_client):
+    author_id = await _create_author(async_client)
+    response = await async_client.post(
+        "/books", json={"title": "Old Title", "author_id": author_id}
+    )
+
+    response = await async_client.patch(
+        f"/books/{response.json()['id']}",
+        json={"author_id": "11111111-1111-1111-1111-111111111111"},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == starlette.status.HTTP_400_BAD_REQUEST
+
+
+async def test_update_book_not_found(async_client):
+    response = await async_client.patch(
+        "/books/11111111-1111-1111-1111-111111111111",
+        json={"title": "New Title"},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == starlette.status.HTTP_404_NOT_FOUND
+
+
+async def _create_book(async_client, name="Test Author"):
+    response = await async_client.post("/authors", json={"name": name})
+    author_id = response.json()["id"]
+    response = await async_client.post(
+        "/books", json={"title": "No Longer Human", "author_id": author_id}
+    )
+    return author_id, response.json()["id"]
+
+
+async def test_delete_book_twice_keeps_counters(async_client, async_session):
+    author_id, book_id = await _create_book(async_client)
+
+    async with async_session() as first, async_session() as second:
+        first_book = await book_crud.get_book_by_id(first, book_id=book_id)
+        second_book = await book_crud.get_book_by_id(second, book_id=book_id)
+        assert await book_crud.delete_book(first, original=first_book) is True
+        assert await book_crud.delete_book(second, original=second_book) is False
+
+    response = await async_client.get("/books")
+    assert response.headers["X-Total-Count"] == "0"
+    response = await async_client.get(f"/authors/{author_id}/stats")
+    assert response.json()["book_count"] == 0
+
+
+async def test_delete_book_after_author_change_decrements_new_author(
+    async_client, async_session
+):
+    author_id, book_id = await _create_book(async_client)
+    response = await async_client.post("/authors", json={"name": "Other Author"})
+    other_author_id = response.json()["id"]
+
+    async with async_session() as session:
+        stale = await book_crud.get_book_by_id(session, book_id=book_id)
+        response = await async_client.patch(
+            f"/books/{book_id}",
+            json={"author_id": other_author_id},
+            headers={"If-Match": "*"},
+        )
+        assert response.status_code == starlette.status.HTTP_200_OK
+        assert await book_crud.delete_book(session, original=stale) is True
+
+    response = await async_client.get(f"/authors/{author_id}/stats")
+    assert response.json()["book_count"] == 0
+    response = await async_client.get(f"/authors/{other_author_id}/stats")
+    assert response.json()["book_count"] == 0
@@ -62,3 +62,126 @@ async def test_delete_book(async_client):
     response = await async_client.get("/books")
     assert response.status_code == starlette.status.HTTP_200_OK
     assert response.json() == []
+
+
+async def test_list_books_sparse_fields(async_client):
+    author_id = await _create_author(async_client)
+    await async_client.post(
+        "/books", json={"title": "No Longer Human", "author_id": author_id}
+    )
+
+    response = await async_client.get("/books", params={"fields": "title,id"})
+    assert response.status_code == starlette.status.HTTP_200_OK
+    response_obj = response.json()
+    assert len(response_obj) == 1
+    assert set(response_obj[0]) == {"id", "title"}
+    assert response_obj[0]["title"] == "No Longer Human"
+
+
+async def test_get_book(async_client):
+    author_id = await _create_author(async_client)
+    response = await async_client.post(
+        "/books", json={"title": "No Longer Human", "author_id": author_id}
+    )
+    book_id = response.json()["id"]
+
+    response = await async_client.get(f"/books/{book_id}")
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == {
+        "id": book_id,
+        "title": "No Longer Human",
+        "author_id": author_id,
+        "version": 1,
+    }
+    assert response.headers["ETag"] == '"1"'
+
+    response = await async_client.get(f"/books/{book_id}", params={"fields": "title"})
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == {"title": "No Longer Human"}
+
+
+async def test_list_books_by_ids(async_client):
+    author_id = await _create_author(async_client)
+    book_ids = []
+    for title in ["A Title", "B Title", "C Title"]:
+        response = await async_client.post(
+            "/books", json={"title": title, "author_id": author_id}
+        )
+        book_ids.append(response.json()["id"])
+
+    requested = [book_ids[2], "11111111-1111-1111-1111-111111111111", book_ids[0]]
+    response = await async_client.get("/books", params={"ids": ",".join(requested)})
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == ["C Title", "A Title"]
+
+
+async def test_list_books_total_count(async_client):
+    author_id = await _create_author(async_client)
+    for title in ["A Title", "B Title"]:
+        response = await async_client.post(
+            "/books", json={"title": title, "author_id": author_id}
+        )
+    await async_client.delete(f"/books/{response.json()['id']}")
+
+    response = await async_client.get("/books")
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = await async_client.get("/books", params={"fields": "id"})
+    assert response.headers["X-Total-Count"] == "1"
+
+
+async def test_update_book(async_client):
+    author_id = await _create_author(async_client, name="A Author")
+    other_author_id = await _create_author(async_client, name="B Author")
+    response = await async_client.post(
+        "/books", json={"title": "Old Title", "author_id": author_id}
+    )
+    book_id = response.json()["id"]
+
+    response = await async_client.patch(
+        f"/books/{book_id}",
+        json={"title": "New Title", "author_id": other_author_id},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == {
+        "id": book_id,
+        "title": "New Title",
+        "author_id": other_author_id,
+        "version": 2,
+    }
+    assert response.headers["ETag"] == '"2"'
+
+    response = await async_client.get(f"/authors/{author_id}/stats")
+    assert response.json()["book_count"] == 0
+    response = await async_client.get(f"/authors/{other_author_id}/stats")
+    assert response.json()["book_count"] == 1
+
+
+async def test_list_books_paginated(async_client):
+    author_id = await _create_author(async_client)
+    for title in ["C Title", "A Title", "B Title"]:
+        await async_client.post("/books", json={"title": title, "author_id": author_id})
+
+    response = await async_client.get("/books", params={"offset": 1, "limit": 1})
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == ["B Title"]
+    assert response.headers["X-Total-Count"] == "3"
+
+
+async def test_list_books_same_title_ordered_by_id(async_client):
+    author_id = await _create_author(async_client)
+    book_ids = []
+    for _ in range(3):
+        response = await async_client.post(
+            "/books", json={"title": "Same Title", "author_id": author_id}
+        )
+        book_ids.append(response.json()["id"])
+
+    pages = []
+    for offset in range(3):
+        response = await async_client.get(
+            "/books", params={"offset": offset, "limit": 1}
+        )
+        pages.extend(item["id"] for item in response.json())
+    assert pages == sorted(book_ids)
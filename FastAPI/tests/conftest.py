@@ -11,7 +11,7 @@ ASYNC_DB_URL = "sqlite+aiosqlite:///:memory:"
 
 
 @pytest_asyncio.fixture
-async def async_client() -> AsyncClient:
+async def async_session():
     async_engine = create_async_engine(
         ASYNC_DB_URL,
         echo=False,
@@ -27,6 +27,14 @@ async def async_client() -> AsyncClient:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
+    try:
+        yield async_session
+    finally:
+        await async_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_client(async_session) -> AsyncClient:
     async def get_test_db():
         async with async_session() as session:
             yield session
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+import starlette.status
+from sqlalchemy import create_engine, delete, event, update
+
+import api.main
+from api.cruds.counter import reconcile_counters
+from api.db import Base
+from api.jobs.counters import reconcile_once
+from api.main import create_app
+from api.models import model
+from api.settings import Settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_reconcile_fixes_drifted_counters(async_client, async_session):
+    response = await async_client.post("/authors", json={"name": "Osamu Dazai"})
+    author_id = response.json()["id"]
+    await async_client.post("/books", json={"title": "A Title", "author_id": author_id})
+
+    async with async_session() as session:
+        await session.execute(update(model.Author).values(book_count=42))
+        await session.execute(update(model.Counter).values(value=42))
+        await session.commit()
+
+    await reconcile_once(async_session)
+
+    response = await async_client.get(f"/authors/{author_id}/stats")
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json()["book_count"] == 1
+    response = await async_client.get("/books")
+    assert response.headers["X-Total-Count"] == "1"
+    response = await async_client.get("/authors")
+    assert response.headers["X-Total-Count"] == "1"
+
+
+async def test_reconcile_fixes_book_counts_in_chunks(async_client, async_session):
+    author_ids = []
+    for name in ("A", "B", "C"):
+        response = await async_client.post("/authors", json={"name": name})
+        author_ids.append(response.json()["id"])
+    for author_id in author_ids[:2]:
+        await async_client.post(
+            "/books", json={"title": "A Title", "author_id": author_id}
+        )
+
+    async with async_session() as session:
+        await session.execute(update(model.Author).values(book_count=42))
+        await session.commit()
+        commits = []
+        event.listen(session.sync_session, "after_commit", commits.append)
+        await reconcile_counters(session, chunk_size=2)
+
+    # 著者 3 人を 2 人ずつ再計算してコミットし、最後にカウンタをコミットする
+    assert len(commits) == 3
+    for author_id, expected in zip(author_ids, (1, 1, 0)):
+        response = await async_client.get(f"/authors/{author_id}/stats")
+        assert response.json()["book_count"] == expected
+
+
+async def test_reconcile_recreates_missing_counter(async_client, async_session):
+    await async_client.post("/authors", json={"name": "Osamu Dazai"})
+
+    async with async_session() as session:
+        await session.execute(delete(model.Counter))
+        await session.commit()
+
+    await reconcile_once(async_session)
+
+    response = await async_client.get("/authors")
+    assert response.headers["X-Total-Count"] == "1"
+    response = await async_client.get("/books")
+    assert response.headers["X-Total-Count"] == "0"
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+async def test_reconcile_job_follows_setting(tmp_path, monkeypatch, enabled):
+    path = tmp_path / "books.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    started = []
+
+    async def fake_reconcile_periodically(session_factory, interval):
+        started.append(interval)
+
+    monkeypatch.setattr(api.main, "reconcile_periodically", fake_reconcile_periodically)
+    app = create_app(
+        Settings(
+            db_url=f"sqlite+aiosqlite:///{path}",
+            db_echo=False,
+            warmup_statements=False,
+            counter_reconcile_enabled=enabled,
+        )
+    )
+
+    async with app.router.lifespan_context(app):
+        await asyncio.sleep(0)
+
+    assert started == ([300.0] if enabled else [])
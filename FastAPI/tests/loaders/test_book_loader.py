@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+import api.cruds.book as book_crud
+from api.loaders.book import BookLoader
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def crud_calls(monkeypatch):
+    calls = []
+
+    async def fake_get_books_by_ids(db, book_ids, fields):
+        calls.append((list(book_ids), tuple(fields)))
+        return [
+            {"id": book_id, "title": f"title-{book_id}", "author_id": "a"}
+            for book_id in book_ids
+            if book_id != "missing"
+        ]
+
+    monkeypatch.setattr(book_crud, "get_books_by_ids", fake_get_books_by_ids)
+    return calls
+
+
+async def test_loads_in_same_tick_are_batched(crud_calls):
+    loader = BookLoader(db=None)
+
+    results = await asyncio.gather(
+        loader.load("b"), loader.load("a"), loader.load("missing")
+    )
+
+    assert len(crud_calls) == 1
+    assert crud_calls[0][0] == ["b", "a", "missing"]
+    assert [r["id"] if r else None for r in results] == ["b", "a", None]
+
+
+async def test_load_many_is_chunked_and_ordered(crud_calls):
+    loader = BookLoader(db=None, max_batch_size=2)
+
+    results = await loader.load_many(["c", "a", "b"])
+
+    assert [ids for ids, _ in crud_calls] == [["c", "a"], ["b"]]
+    assert [r["id"] for r in results] == ["c", "a", "b"]
+
+
+async def test_results_are_cached_per_loader(crud_calls):
+    loader = BookLoader(db=None)
+
+    await loader.load("a")
+    await loader.load("a")
+
+    assert len(crud_calls) == 1
+
+
+async def test_fields_are_projected_but_id_is_selected(crud_calls):
+    loader = BookLoader(db=None, fields=("title",))
+
+    result = await loader.load("a")
+
+    assert crud_calls[0][1] == ("id", "title")
+    assert result == {"title": "title-a"}
+
+
+async def test_aclose_cancels_fetch_left_by_cancelled_caller(monkeypatch):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_get_books_by_ids(db, book_ids, fields):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(book_crud, "get_books_by_ids", slow_get_books_by_ids)
+    loader = BookLoader(db=None)
+
+    caller = asyncio.ensure_future(loader.load("a"))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    # 呼び出し元がキャンセルされても共有のクエリは残っている
+    assert not cancelled.is_set()
+
+    await loader.aclose()
+
+    assert cancelled.is_set()
+    assert not loader._tasks
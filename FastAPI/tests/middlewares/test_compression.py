@@ -0,0 +1,246 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+import api.middlewares.compression as compression
+from api.middlewares.compression import (
+    CompressedResponseCache,
+    CompressionMiddleware,
+    select_encoding,
+)
+
+pytestmark = pytest.mark.asyncio
+
+LARGE_BODY = json.dumps([{"id": str(i), "title": "title"} for i in range(200)])
+
+
+async def _call(app, path="/", accept_encoding="gzip"):
+    messages = []
+    headers = []
+    if accept_encoding:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+    }
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # StreamingResponse は切断を待ち続けるため、送信が終わるまで待たせる
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    return (
+        start["status"],
+        {k.decode(): v.decode() for k, v in start["headers"]},
+        [m for m in messages[1:] if m["type"] == "http.response.body"],
+    )
+
+
+def _body(chunks):
+    return b"".join(m.get("body", b"") for m in chunks)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def inner_app(calls):
+    async def books(request):
+        calls.append(request.url.path)
+        return Response(LARGE_BODY, media_type="application/json")
+
+    async def small(request):
+        return Response("[]", media_type="application/json")
+
+    async def encoded(request):
+        return Response(
+            gzip.compress(LARGE_BODY.encode()),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    async def stream(request):
+        async def chunks():
+            for _ in range(4):
+                yield LARGE_BODY
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    return Starlette(
+        routes=[
+            Route("/books", books),
+            Route("/small", small),
+            Route("/encoded", encoded),
+            Route("/stream", stream),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", "gzip"),
+        ("*, gzip;q=0", None),
+        ("", None),
+    ],
+)
+async def test_select_encoding(accept_encoding, expected):
+    assert select_encoding(accept_encoding, ("gzip",)) == expected
+
+
+async def test_large_response_is_compressed(inner_app):
+    status, headers, chunks = await _call(CompressionMiddleware(inner_app), "/books")
+
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(_body(chunks))
+    assert gzip.decompress(_body(chunks)).decode() == LARGE_BODY
+
+
+@pytest.mark.parametrize("thread_min_size, threaded", [(1, True), (10**9, False)])
+async def test_large_body_is_compressed_off_the_event_loop(
+    inner_app, monkeypatch, thread_min_size, threaded
+):
+    offloaded = []
+
+    async def to_thread(func, *args):
+        offloaded.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(compression.asyncio, "to_thread", to_thread)
+    middleware = CompressionMiddleware(inner_app, thread_min_size=thread_min_size)
+
+    _, headers, chunks = await _call(middleware, "/books")
+
+    assert bool(offloaded) is threaded
+    assert int(headers["content-length"]) == len(_body(chunks))
+    assert gzip.decompress(_body(chunks)).decode() == LARGE_BODY
+
+
+async def test_small_response_is_not_compressed(inner_app):
+    _, headers, chunks = await _call(CompressionMiddleware(inner_app), "/small")
+
+    assert "content-encoding" not in headers
+    assert _body(chunks) == b"[]"
+
+
+async def test_identity_request_gets_vary_only(inner_app):
+    _, headers, chunks = await _call(
+        CompressionMiddleware(inner_app), "/books", accept_encoding=None
+    )
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert _body(chunks).decode() == LARGE_BODY
+
+
+async def test_encoded_response_is_passed_through(inner_app):
+    _, headers, chunks = await _call(CompressionMiddleware(inner_app), "/encoded")
+
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(_body(chunks)).decode() == LARGE_BODY
+
+
+async def test_streamed_response_is_compressed_per_chunk(inner_app):
+    _, headers, chunks = await _call(
+        CompressionMiddleware(inner_app, minimum_size=10**9), "/stream"
+    )
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(chunks) > 1
+    assert all(m["more_body"] for m in chunks[:-1])
+    assert gzip.decompress(_body(chunks)).decode() == LARGE_BODY * 4
+
+
+async def test_streamed_chunks_are_flushed(inner_app):
+    _, _, chunks = await _call(
+        CompressionMiddleware(inner_app, minimum_size=10**9), "/stream"
+    )
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    received = b""
+    for count, message in enumerate(chunks[:4], start=1):
+        received += decompressor.decompress(message["body"])
+        # 後続のチャンクを待たずに、ここまでに送った本文をすべて伸長できる
+        assert received.decode() == LARGE_BODY * count
+
+
+async def test_cached_body_is_reused_within_generation(inner_app, calls):
+    generation = {"value": 1}
+    cache = CompressedResponseCache(
+        paths=frozenset({"/books"}),
+        generation=lambda: generation["value"],
+        max_bytes=1024 * 1024,
+    )
+    app = CompressionMiddleware(inner_app, cache=cache)
+
+    first = await _call(app, "/books")
+    second = await _call(app, "/books")
+    generation["value"] = 2
+    await _call(app, "/books")
+
+    assert calls == ["/books", "/books"]
+    assert second == first
+
+
+async def test_cache_disabled_while_generation_unknown(inner_app, calls):
+    cache = CompressedResponseCache(
+        paths=frozenset({"/books"}), generation=lambda: None, max_bytes=1024 * 1024
+    )
+    app = CompressionMiddleware(inner_app, cache=cache)
+
+    await _call(app, "/books")
+    await _call(app, "/books")
+
+    assert calls == ["/books", "/books"]
+    assert len(cache) == 0
+
+
+async def test_cache_evicts_least_recently_used():
+    cache = CompressedResponseCache(
+        paths=frozenset({"/books"}), generation=lambda: 1, max_bytes=10
+    )
+
+    cache.put(("a",), 1, 200, [], b"x" * 4)
+    cache.put(("b",), 1, 200, [], b"x" * 4)
+    cache.get(("a",), 1)
+    cache.put(("c",), 1, 200, [], b"x" * 4)
+
+    assert cache.get(("a",), 1) is not None
+    assert cache.get(("b",), 1) is None
+    assert cache.get(("c",), 1) is not None
+
+
+async def test_api_list_is_compressed(async_client):
+    for i in range(20):
+        await async_client.post("/authors", json={"name": f"author-{i:02d}"})
+
+    response = await async_client.get("/authors", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
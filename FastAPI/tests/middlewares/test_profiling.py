@@ -0,0 +1,130 @@
+import pstats
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from api.db import get_db
+from api.main import create_app
+from api.settings import Settings
+
+pytestmark = pytest.mark.asyncio
+
+TOKEN = "profile-token-0123456789"
+
+
+@pytest_asyncio.fixture
+async def profiling_app(async_session, tmp_path):
+    app = create_app(
+        Settings(
+            profiling_enabled=True,
+            profiling_token=TOKEN,
+            profiling_dir=str(tmp_path),
+            profiling_max_files=2,
+        )
+    )
+
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    return app
+
+
+@pytest_asyncio.fixture
+async def profiling_client(profiling_app):
+    async with AsyncClient(app=profiling_app, base_url="http://test") as client:
+        yield client
+
+
+async def test_header_triggered_request_is_profiled(profiling_client):
+    response = await profiling_client.get("/books", headers={"X-Profile-Token": TOKEN})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    listing = await profiling_client.get(
+        "/debug/profiles", headers={"X-Profile-Token": TOKEN}
+    )
+    assert listing.status_code == 200
+    [summary] = listing.json()
+    assert summary["id"] == profile_id
+    assert summary["path"] == "/books"
+    assert summary["trigger"] == "header"
+    assert summary["db_statements"] >= 1
+    assert summary["db_ms"] > 0
+    assert summary["wall_ms"] == pytest.approx(
+        summary["db_ms"] + summary["loop_ms"], abs=0.01
+    )
+
+
+async def test_untriggered_request_is_not_profiled(profiling_client, tmp_path):
+    response = await profiling_client.get(
+        "/books", headers={"X-Profile-Token": "wrong-token-0123456789"}
+    )
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_profiles_are_kept_in_bounded_ring(profiling_client, tmp_path):
+    ids = []
+    for _ in range(3):
+        response = await profiling_client.get(
+            "/books", headers={"X-Profile-Token": TOKEN}
+        )
+        ids.append(response.headers["X-Profile-Id"])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{profile_id}{suffix}"
+        for profile_id in ids[1:]
+        for suffix in (".json", ".prof")
+    )
+
+
+async def test_profile_download_is_pstats(profiling_client, tmp_path):
+    response = await profiling_client.get("/books", headers={"X-Profile-Token": TOKEN})
+    profile_id = response.headers["X-Profile-Id"]
+
+    download = await profiling_client.get(
+        f"/debug/profiles/{profile_id}", headers={"X-Profile-Token": TOKEN}
+    )
+    assert download.status_code == 200
+    path = tmp_path / "downloaded.prof"
+    path.write_bytes(download.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+async def test_sampled_request_is_profiled(async_session, tmp_path):
+    app = create_app(
+        Settings(
+            profiling_enabled=True,
+            profiling_sample_rate=1.0,
+            profiling_dir=str(tmp_path),
+        )
+    )
+
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/authors")
+
+    assert "X-Profile-Id" in response.headers
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Profile-Token": "wrong-token-0123456789"}])
+async def test_listing_requires_token(profiling_client, headers):
+    response = await profiling_client.get("/debug/profiles", headers=headers)
+
+    assert response.status_code == 403
+
+
+async def test_debug_routes_absent_when_disabled(async_client):
+    response = await async_client.get("/debug/profiles")
+
+    assert response.status_code == 404
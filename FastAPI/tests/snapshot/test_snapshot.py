@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+import starlette.status
+from sqlalchemy.dialects import mysql
+
+import api.cruds.author as author_crud
+import api.cruds.book as book_crud
+from api.cruds.change import prune_changes
+from api.main import app
+from api.snapshot import CatalogueSnapshot
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def snapshot(async_client, async_session):
+    snapshot = CatalogueSnapshot()
+    app.state.snapshot = snapshot
+    try:
+        yield snapshot
+    finally:
+        app.state.snapshot = None
+
+
+async def _refresh(snapshot, async_session):
+    async with async_session() as session:
+        await snapshot.refresh(session)
+
+
+async def _create_books(async_client, titles):
+    response = await async_client.post("/authors", json={"name": "Test Author"})
+    author_id = response.json()["id"]
+    book_ids = []
+    for title in titles:
+        response = await async_client.post(
+            "/books", json={"title": title, "author_id": author_id}
+        )
+        book_ids.append(response.json()["id"])
+    return author_id, book_ids
+
+
+async def test_snapshot_matches_db(async_client, async_session):
+    # 大文字・小文字や非 ASCII が混ざっても、DB とスナップショットで同じ順に並ぶ
+    await _create_books(
+        async_client, ["b title", "B Title", "Ä Title", "a Title", "C Title"]
+    )
+    db_books = (await async_client.get("/books")).json()
+    db_authors = (await async_client.get("/authors")).json()
+
+    snapshot = CatalogueSnapshot()
+    async with async_session() as session:
+        await snapshot.load(session)
+    app.state.snapshot = snapshot
+    try:
+        response = await async_client.get("/books")
+        assert response.json() == db_books
+        assert response.headers["X-Total-Count"] == "5"
+        assert (await async_client.get("/authors")).json() == db_authors
+    finally:
+        app.state.snapshot = None
+
+
+class _CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return MagicMock()
+
+
+async def test_db_list_order_ignores_mysql_collation():
+    db = _CapturingSession()
+
+    await book_crud.get_books(db, offset=0, limit=1)
+    await book_crud.get_books_projection(db, fields=("id",), offset=0, limit=1)
+    await author_crud.get_authors(db, offset=0, limit=1)
+    await author_crud.get_authors_projection(db, fields=("id",), offset=0, limit=1)
+
+    compiled = [str(s.compile(dialect=mysql.dialect())) for s in db.statements]
+    for sql in compiled[:2]:
+        assert "ORDER BY CAST(books.title AS BINARY), books.id" in sql
+    for sql in compiled[2:]:
+        assert "ORDER BY CAST(authors.name AS BINARY), authors.id" in sql
+
+
+async def test_snapshot_pagination_and_fields(async_client, async_session, snapshot):
+    await _create_books(async_client, ["B Title", "A Title", "C Title"])
+    await _refresh(snapshot, async_session)
+
+    response = await async_client.get(
+        "/books", params={"offset": 1, "limit": 1, "fields": "title"}
+    )
+    assert response.status_code == starlette.status.HTTP_200_OK
+    assert response.json() == [{"title": "B Title"}]
+    assert response.headers["X-Total-Count"] == "3"
+
+
+async def test_snapshot_incremental_refresh(async_client, async_session, snapshot):
+    _, book_ids = await _create_books(async_client, ["A Title", "B Title"])
+    await _refresh(snapshot, async_session)
+
+    await async_client.patch(
+        f"/books/{book_ids[0]}", json={"title": "C Title"}, headers={"If-Match": '"1"'}
+    )
+    await async_client.delete(f"/books/{book_ids[1]}")
+    response = await async_client.get(f"/books/{book_ids[1]}")
+    assert response.status_code == starlette.status.HTTP_200_OK
+
+    await _refresh(snapshot, async_session)
+
+    response = await async_client.get("/books")
+    assert [item["title"] for item in response.json()] == ["C Title"]
+    response = await async_client.get(f"/books/{book_ids[0]}")
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == '"2"'
+    response = await async_client.get(f"/books/{book_ids[1]}")
+    assert response.status_code == starlette.status.HTTP_404_NOT_FOUND
+
+
+async def test_snapshot_reloads_after_pruned_changes(
+    async_client, async_session, snapshot
+):
+    await _create_books(async_client, ["A Title"])
+    await _refresh(snapshot, async_session)
+    await _create_books(async_client, ["B Title", "C Title"])
+    async with async_session() as session:
+        await prune_changes(session, keep=1)
+
+    await _refresh(snapshot, async_session)
+
+    response = await async_client.get("/books")
+    assert [item["title"] for item in response.json()] == [
+        "A Title",
+        "B Title",
+        "C Title",
+    ]
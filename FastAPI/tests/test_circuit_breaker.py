@@ -0,0 +1,120 @@
+import pytest
+
+from api.circuit_breaker import CircuitBreaker
+from api.exceptions import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        failure_threshold=3, slow_call_seconds=1.0, open_seconds=10.0, clock=clock
+    )
+
+
+def _fail(breaker, times):
+    for _ in range(times):
+        breaker.acquire()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    _fail(breaker, 3)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.acquire()
+    assert exc_info.value.retry_after == 10.0
+
+
+def test_success_resets_failure_count(breaker):
+    _fail(breaker, 2)
+    breaker.acquire()
+    breaker.record_success(latency=0.1)
+    _fail(breaker, 2)
+
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures(breaker):
+    for _ in range(3):
+        breaker.acquire()
+        breaker.record_success(latency=1.5)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_admits_single_probe(breaker, clock):
+    _fail(breaker, 3)
+    clock.now = 10.0
+
+    breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    assert breaker.state == "half_open"
+
+
+def test_successful_probe_closes(breaker, clock):
+    _fail(breaker, 3)
+    clock.now = 10.0
+
+    probe = breaker.acquire()
+    breaker.record_success(latency=0.1, probe=probe)
+
+    assert probe is True
+    assert breaker.state == "closed"
+    assert breaker.acquire() is False
+
+
+def test_failed_probe_reopens(breaker, clock):
+    _fail(breaker, 3)
+    clock.now = 10.0
+
+    probe = breaker.acquire()
+    breaker.record_failure(probe)
+
+    assert breaker.state == "open"
+    clock.now = 19.0
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+
+def test_released_probe_frees_slot(breaker, clock):
+    _fail(breaker, 3)
+    clock.now = 10.0
+
+    probe = breaker.acquire()
+    breaker.release(probe)
+
+    breaker.acquire()
+    assert breaker.state == "half_open"
+
+
+def test_late_non_probe_results_do_not_leave_half_open(breaker, clock):
+    late_success = breaker.acquire()
+    late_failure = breaker.acquire()
+    _fail(breaker, 3)
+    clock.now = 10.0
+    probe = breaker.acquire()
+
+    breaker.record_success(latency=0.1, probe=late_success)
+    breaker.record_failure(late_failure)
+
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.record_success(latency=0.1, probe=probe)
+    assert breaker.state == "closed"
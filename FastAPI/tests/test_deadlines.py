@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import api.cruds.book as book_crud
+import api.db
+from api.db import Base, get_db
+from api.deadlines import (
+    RequestDeadline,
+    _current_deadline,
+    install_statement_deadlines,
+)
+from api.main import create_app
+from api.routers import author, book
+from api.settings import Settings
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def slow_get_books(monkeypatch):
+    async def get_books(db, offset=0, limit=None):
+        await db.execute(text("SELECT 1"))
+        await asyncio.sleep(5)
+        return []
+
+    monkeypatch.setattr(book_crud, "get_books", get_books)
+
+
+@pytest.fixture
+def slow_get_books_by_ids(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def get_books_by_ids(db, book_ids, fields=None):
+        await db.execute(text("SELECT 1"))
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return []
+
+    monkeypatch.setattr(book_crud, "get_books_by_ids", get_books_by_ids)
+    return cancelled
+
+
+def _file_settings(tmp_path, **overrides):
+    path = tmp_path / "books.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return Settings(
+        db_url=f"sqlite+aiosqlite:///{path}",
+        db_echo=False,
+        warmup_statements=False,
+        request_deadline=0.05,
+        **overrides,
+    )
+
+
+async def test_route_past_deadline_returns_504(async_session, slow_get_books):
+    app = create_app(Settings(request_deadline=0.05))
+
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/books")
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+
+
+async def test_routers_work_without_create_app(async_session):
+    app = FastAPI()
+    app.include_router(author.router)
+    app.include_router(book.router)
+
+    async def get_test_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        books = await client.get("/books")
+        authors = await client.get("/authors")
+
+    assert books.status_code == 200
+    assert authors.status_code == 200
+
+
+async def test_deadline_trips_circuit_and_releases_connection(tmp_path, slow_get_books):
+    app = create_app(_file_settings(tmp_path, circuit_failure_threshold=1))
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            timed_out = await client.get("/books")
+            rejected = await client.get("/books")
+        checked_out = api.db.async_engine.pool.checkedout()
+
+    assert timed_out.status_code == 504
+    assert rejected.status_code == 503
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert checked_out == 0
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/books/550e8400-e29b-41d4-a716-446655440000",
+        "/books?ids=550e8400-e29b-41d4-a716-446655440000,"
+        "660e8400-e29b-41d4-a716-446655440001",
+    ],
+)
+async def test_deadline_on_loader_route_releases_connection(
+    tmp_path, slow_get_books_by_ids, path
+):
+    app = create_app(_file_settings(tmp_path))
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(path)
+        checked_out = api.db.async_engine.pool.checkedout()
+
+    assert response.status_code == 504
+    assert checked_out == 0
+    # バッチ取得のタスクがリクエスト終了後に残っていない
+    assert slow_get_books_by_ids.is_set()
+
+
+async def test_mysql_select_gets_remaining_time_hint():
+    engine = create_async_engine("mysql+aiomysql://root@db:3306/prod")
+    install_statement_deadlines(engine)
+    conn = SimpleNamespace(info={})
+
+    async with asyncio.timeout(None) as timeout:
+        request_deadline = RequestDeadline(timeout)
+        request_deadline.reschedule(1.5)
+        reset_token = _current_deadline.set(request_deadline)
+        try:
+            [statement] = [
+                listener(conn, None, "SELECT books.id FROM books", {}, None, False)[0]
+                for listener in engine.sync_engine.dispatch.before_cursor_execute
+            ]
+            [update] = [
+                listener(conn, None, "UPDATE books SET version=1", {}, None, False)[0]
+                for listener in engine.sync_engine.dispatch.before_cursor_execute
+            ]
+        finally:
+            _current_deadline.reset(reset_token)
+
+    hint, rest = statement.split("*/")
+    assert hint.startswith("SELECT /*+ MAX_EXECUTION_TIME(")
+    assert 1400 < int(hint[len("SELECT /*+ MAX_EXECUTION_TIME(") : -2]) <= 1500
+    assert rest == " books.id FROM books"
+    assert update == "UPDATE books SET version=1"
@@ -0,0 +1,164 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+
+from api.db import Base
+from api.main import create_app
+from api.models import model
+from api.settings import Settings
+
+STARTUP_BUDGET_SECONDS = 10.0
+WARMUP_TABLE_ROWS = 100000
+WARMUP_OVERHEAD_BUDGET_SECONDS = 0.5
+
+STARTUP_SCRIPT = """
+import time
+
+started = time.perf_counter()
+
+import asyncio
+import json
+import sys
+
+from httpx import AsyncClient
+
+from api.main import create_app
+from api.settings import Settings
+
+imported = time.perf_counter()
+
+
+async def main():
+    app = create_app(Settings(db_url=sys.argv[1], db_echo=False))
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/books")
+    return response.status_code, ready
+
+
+status_code, ready = asyncio.run(main())
+finished = time.perf_counter()
+print(json.dumps({
+    "status_code": status_code,
+    "import_seconds": imported - started,
+    "lifespan_seconds": ready - imported,
+    "first_response_seconds": finished - ready,
+    "total_seconds": finished - started,
+}))
+"""
+
+
+def _create_database(tmp_path):
+    path = tmp_path / "books.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+
+def test_startup_time_to_first_response(tmp_path, record_property):
+    path = _create_database(tmp_path)
+
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT, f"sqlite+aiosqlite:///{path}"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    for name, value in timings.items():
+        record_property(name, value)
+
+    assert timings["status_code"] == 200
+    assert timings["total_seconds"] < STARTUP_BUDGET_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_warmup_leaves_no_data(tmp_path, caplog):
+    path = _create_database(tmp_path)
+    app = create_app(
+        Settings(
+            db_url=f"sqlite+aiosqlite:///{path}", db_echo=False, warmup_writes=True
+        )
+    )
+
+    async with app.router.lifespan_context(app):
+        pass
+
+    assert "warm-up failed" not in caplog.text
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as connection:
+        for table in (model.Author, model.Book, model.Change):
+            count = connection.execute(select(func.count()).select_from(table))
+            assert count.scalar() == 0
+        counters = dict(
+            connection.execute(select(model.Counter.name, model.Counter.value)).all()
+        )
+    engine.dispose()
+    assert counters == {"authors": 0, "books": 0}
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_on_read_only_database(tmp_path, caplog):
+    path = _create_database(tmp_path)
+    app = create_app(
+        Settings(
+            db_url=f"sqlite+aiosqlite:///file:{path}?mode=ro&uri=true",
+            db_echo=False,
+        )
+    )
+
+    async with app.router.lifespan_context(app):
+        pass
+
+    assert "warm-up failed" not in caplog.text
+
+
+async def _lifespan_seconds(path, **overrides):
+    app = create_app(
+        Settings(db_url=f"sqlite+aiosqlite:///{path}", db_echo=False, **overrides)
+    )
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+    return ready - started
+
+
+@pytest.mark.asyncio
+async def test_warmup_does_not_scale_with_table_size(tmp_path, caplog):
+    path = _create_database(tmp_path)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(insert(model.Author), [{"id": "author", "name": "Dazai"}])
+        connection.execute(
+            insert(model.Book),
+            [
+                {"id": f"{i:036d}", "title": f"title-{i}", "author_id": "author"}
+                for i in range(WARMUP_TABLE_ROWS)
+            ],
+        )
+    engine.dispose()
+
+    loaded = []
+
+    def count_load(target, context):
+        loaded.append(target)
+
+    event.listen(model.Book, "load", count_load)
+    try:
+        cold = await _lifespan_seconds(path, warmup_statements=False)
+        warm = await _lifespan_seconds(path)
+    finally:
+        event.remove(model.Book, "load", count_load)
+
+    assert "warm-up failed" not in caplog.text
+    # limit=1 の一覧で 1 件だけ生成される (全件取得なら書籍ごとに生成される)
+    assert len(loaded) <= 1
+    assert warm - cold < WARMUP_OVERHEAD_BUDGET_SECONDS